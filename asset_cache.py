@@ -0,0 +1,73 @@
+# asset_cache.py
+import base64
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+
+
+# Process-wide cache of data: URLs for small UI images (badge, icons...), shared
+# by every session: memory is O(assets), not O(sessions x assets).
+# Entries are keyed on the absolute path and re-encoded when the file's
+# (mtime_ns, size) changes; least recently used entries go first once either
+# bound is hit.
+
+MAX_ENTRIES = 64
+MAX_BYTES = 16 * 1024 * 1024  # total length of the cached URLs
+
+_LOCK = threading.Lock()
+_ENTRIES = OrderedDict()  # abspath -> (stamp, url)
+_STATS = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+
+def _encode(path: str) -> str:
+    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    with open(path, "rb") as f:
+        b64 = base64.b64encode(f.read()).decode("ascii")
+    return f"data:{mime};base64,{b64}"
+
+
+def data_url(path: str) -> str | None:
+    """data: URL for the file at path, or None if it can't be read."""
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(key)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    with _LOCK:
+        entry = _ENTRIES.get(key)
+        if entry is not None and entry[0] == stamp:
+            _ENTRIES.move_to_end(key)
+            _STATS["hits"] += 1
+            return entry[1]
+
+    try:
+        url = _encode(key)
+    except OSError:
+        return None
+
+    with _LOCK:
+        old = _ENTRIES.pop(key, None)
+        if old is not None:
+            _STATS["bytes"] -= len(old[1])
+        _ENTRIES[key] = (stamp, url)
+        _STATS["bytes"] += len(url)
+        _STATS["misses"] += 1
+        while len(_ENTRIES) > 1 and (len(_ENTRIES) > MAX_ENTRIES or _STATS["bytes"] > MAX_BYTES):
+            _, (_, dropped) = _ENTRIES.popitem(last=False)
+            _STATS["bytes"] -= len(dropped)
+            _STATS["evictions"] += 1
+    return url
+
+
+def stats() -> dict:
+    with _LOCK:
+        return {**_STATS, "entries": len(_ENTRIES)}
+
+
+def clear() -> None:
+    with _LOCK:
+        _ENTRIES.clear()
+        _STATS["bytes"] = 0
@@ -0,0 +1,151 @@
+# balance_index.py
+import threading
+import time
+from datetime import datetime, timezone
+
+from bank_store import tx_deltas
+
+
+# balances_by_user is an index over txs. Its checkpoint lives in bank["meta"]:
+#   tx_seq       last seq handed out to a tx
+#   balances_seq last seq already folded into balances_by_user
+# Row/journal backends keep balances in sync on write, so this only runs for JSON.
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _apply_user_delta(balances: dict, tx: dict) -> None:
+    uid = tx.get("user_id") or "user-1"
+    delta = int(tx_deltas(tx).get("user", 0))
+    if delta:
+        balances[uid] = max(0, int(balances.get(uid, 0)) + delta)
+
+
+def recompute_balances(history) -> tuple[dict, int]:
+    """Full replay over txs (oldest-first). Returns (balances, txs_seen)."""
+    balances = {}
+    n = 0
+    for tx in history:
+        _apply_user_delta(balances, tx)
+        n += 1
+    return balances, n
+
+
+def needs_catch_up(bank: dict) -> bool:
+    txs = bank.get("txs") or []
+    if not txs:
+        return False
+    meta = bank.get("meta") or {}
+    if meta.get("balances_seq") is None:
+        return True
+    return int(txs[0].get("seq", 0) or 0) > int(meta["balances_seq"])
+
+
+def catch_up(bank: dict) -> int:
+    """
+    Bring balances_by_user up to the newest tx. Returns how many txs were applied.
+    - No checkpoint yet (legacy file): number the txs once (oldest = 1), and only
+      replay them if balances_by_user is empty; otherwise trust the stored balances.
+    - Checkpoint present: apply just the txs with seq > balances_seq.
+    """
+    meta = bank.setdefault("meta", {})
+    balances = bank.setdefault("balances_by_user", {})
+    if balances is None:
+        balances = bank["balances_by_user"] = {}
+    txs = bank.get("txs") or []
+
+    if meta.get("balances_seq") is None:
+        for i, tx in enumerate(reversed(txs), start=1):
+            tx["seq"] = i
+        applied = 0
+        if not balances:
+            rebuilt, applied = recompute_balances(reversed(txs))
+            balances.update(rebuilt)
+        meta["tx_seq"] = len(txs)
+        meta["balances_seq"] = len(txs)
+        meta["updated_at"] = _now_iso()
+        return applied
+
+    checkpoint = int(meta["balances_seq"])
+    pending = []
+    for tx in txs:  # newest-first: stop at the checkpoint
+        seq = int(tx.get("seq", 0) or 0)
+        if seq <= checkpoint:
+            break
+        pending.append(tx)
+
+    for tx in reversed(pending):
+        _apply_user_delta(balances, tx)
+        checkpoint = max(checkpoint, int(tx.get("seq", 0) or 0))
+
+    meta["balances_seq"] = checkpoint
+    meta["tx_seq"] = max(int(meta.get("tx_seq", 0) or 0), checkpoint)
+    if pending:
+        meta["updated_at"] = _now_iso()
+    return len(pending)
+
+
+def advance(bank: dict, tx: dict) -> None:
+    """record_tx() hook: the balance was already updated in-place, move the checkpoint."""
+    seq = tx.get("seq")
+    meta = bank.setdefault("meta", {})
+    if seq is None or meta.get("balances_seq") is None:
+        return
+    if int(seq) == int(meta["balances_seq"]) + 1:
+        meta["balances_seq"] = int(seq)
+
+
+# ============================================================
+# Background verification (drift report, never blocks a rerun)
+# ============================================================
+_REPORTS = {}  # key -> report dict
+_LOCK = threading.Lock()
+
+
+def _run_verification(key: str, indexed: dict, history_fn) -> None:
+    t0 = time.perf_counter()
+    try:
+        recomputed, n = recompute_balances(history_fn())
+        drift = {}
+        for uid in sorted(set(indexed) | set(recomputed)):
+            a = int(indexed.get(uid, 0))
+            b = int(recomputed.get(uid, 0))
+            if a != b:
+                drift[uid] = {"indexed": a, "recomputed": b, "diff": a - b}
+        report = {"status": "done", "checked_txs": n, "users": len(recomputed), "drift": drift}
+    except Exception as e:
+        report = {"status": "error", "error": str(e)}
+
+    report["finished_at"] = _now_iso()
+    report["seconds"] = round(time.perf_counter() - t0, 3)
+    with _LOCK:
+        _REPORTS[key] = {**_REPORTS.get(key, {}), **report}
+
+
+def start_verification(key: str, bank: dict, history_fn) -> bool:
+    """
+    Recompute balances from full history in a daemon thread and compare with the
+    current balances_by_user. history_fn() must be thread-safe and return txs
+    oldest-first. Returns False if a run for this key is already in flight.
+    """
+    with _LOCK:
+        if (_REPORTS.get(key) or {}).get("status") == "running":
+            return False
+        _REPORTS[key] = {"status": "running", "started_at": _now_iso()}
+
+    indexed = dict(bank.get("balances_by_user") or {})
+    threading.Thread(
+        target=_run_verification,
+        args=(key, indexed, history_fn),
+        name=f"balance-verify:{key}",
+        daemon=True,
+    ).start()
+    return True
+
+
+def verification_report(key: str) -> dict | None:
+    with _LOCK:
+        report = _REPORTS.get(key)
+        return dict(report) if report else None
@@ -0,0 +1,1016 @@
+# bank_store.py
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+import file_txn
+import json_cache
+import tx_index
+
+
+# Backends:
+#   "json"    whole-file rewrite (original behavior)
+#   "sqlite"  one row per tx / per user balance
+#   "journal" append-only JSON-lines journal + periodic snapshot
+DEFAULT_BACKEND = "json"
+
+# How many of the newest txs a row/journal backend hydrates into bank["txs"] on load
+RECENT_WINDOW = 200
+
+# Journal tuning knobs
+SNAPSHOT_EVERY = 500  # txs appended before a compacted snapshot is written
+FSYNC_EVERY = 32  # txs appended before an fsync
+FSYNC_SECONDS = 1.0  # ...or this long since the last fsync, whichever comes first
+
+# Share of every code redemption that goes to sld_network_fund (currency.md: 95/5)
+FUND_SHARE_PCT = 5
+
+# Top-level bank keys stored as columns/rows; anything else is kept as a JSON doc
+TOTAL_KEYS = ("balance", "sld_network_fund", "total_earned", "total_spent")
+CORE_KEYS = TOTAL_KEYS + ("balances_by_user", "txs")
+
+_DELETED = object()  # doc-change marker: the key was removed from the bank
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _read_json(path: str, default):
+    try:
+        if not os.path.exists(path):
+            return default
+        with open(path, "r", encoding="utf-8") as f:
+            raw = f.read().strip()
+        return json.loads(raw) if raw else default
+    except Exception:
+        return default
+
+
+def _write_json(path: str, data) -> None:
+    # Atomic-ish write: write temp then replace
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def redemption_split(amount: int) -> tuple[int, int]:
+    """Code redemption (currency.md 95/5) -> (user share, sld_network_fund share)."""
+    amount = int(amount)
+    user = amount * (100 - FUND_SHARE_PCT) // 100
+    return user, amount - user
+
+
+def tx_deltas(tx: dict) -> dict:
+    """
+    Ledger effect of one tx (same rules as deposit()/spend()/redeem() in streamlit_app):
+    - deposit: user +amt, global +amt, total_earned +amt
+    - spend:   user -amt, global +amt (spend flows into the pool), total_spent +amt
+    - redeem:  amt is the code value, split by redemption_split(); the user leg is
+               credited like a deposit, the fund leg goes to sld_network_fund
+    Unknown types only get logged.
+    """
+    amt = int(tx.get("amount", 0))
+    typ = tx.get("type")
+    if typ == "deposit":
+        return {"user": amt, "balance": amt, "total_earned": amt}
+    if typ == "redeem":
+        user, fund = redemption_split(amt)
+        return {"user": user, "balance": user, "total_earned": user, "sld_network_fund": fund}
+    if typ == "spend":
+        return {"user": -amt, "balance": amt, "total_spent": amt}
+    return {}
+
+
+def apply_tx(bank: dict, tx: dict) -> None:
+    """Apply tx_deltas() to an in-memory bank (used when replaying history)."""
+    d = tx_deltas(tx)
+    uid = tx.get("user_id") or "user-1"
+    balances = bank.setdefault("balances_by_user", {})
+    if d.get("user"):
+        balances[uid] = max(0, int(balances.get(uid, 0)) + int(d["user"]))
+    for key in TOTAL_KEYS:
+        if d.get(key):
+            bank[key] = int(bank.get(key, 0) or 0) + int(d[key])
+
+
+def _bank_docs(bank: dict) -> dict:
+    # Everything that isn't a total / balance / tx (meta, used codes, market history...)
+    return {k: v for k, v in bank.items() if k not in CORE_KEYS}
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+# ============================================================
+# JSON backend (original: whole file per save)
+# ============================================================
+class JsonBankStore:
+    """
+    Keeps the original careon_bank_v2.json layout.
+    Every save() re-serializes the whole bank (balances + full txs list).
+    Writes are compare-and-swap on meta["rev"] (see file_txn); use transact()
+    for read-modify-write so concurrent sessions/processes don't lose updates.
+    """
+
+    backend = "json"
+    maintains_balances = False  # balances_by_user is caught up via balance_index
+
+    def __init__(self, path: str, *, load_fn=None, save_fn=None):
+        self.path = path
+        self._load_fn = load_fn
+        self._save_fn = save_fn
+        self._stamp = None
+
+    def load(self, default: dict) -> dict:
+        self._stamp = json_cache.file_stamp(self.path)
+        if self._load_fn is not None:
+            return self._load_fn(self.path, default)
+        return _read_json(self.path, default)
+
+    def _write(self, path: str, bank: dict) -> None:
+        if self._save_fn is not None:
+            self._save_fn(path, bank)
+        else:
+            _write_json(path, bank)
+
+    def stage(self, bank: dict, tx: dict) -> None:
+        meta = bank.setdefault("meta", {})
+        tx["seq"] = int(meta.get("tx_seq", 0) or 0) + 1
+        meta["tx_seq"] = tx["seq"]
+        txs = bank.setdefault("txs", [])
+        txs.insert(0, tx)
+
+        idx = self._index()
+        with idx.lock:
+            if idx.last_seq == tx["seq"] - 1:
+                idx.add(tx["seq"], tx.get("user_id"), len(txs) - 1)
+
+    def save(self, bank: dict) -> None:
+        """CAS write: raises file_txn.ConflictError if the file moved past our rev."""
+        file_txn.cas_write_json(self.path, bank, file_txn.get_rev(bank), self._stamp, self._write)
+        self._stamp = json_cache.file_stamp(self.path)
+
+    def note_saved(self) -> None:
+        """Re-stamp after the file was written outside save() (file_txn.commit_files)."""
+        self._stamp = json_cache.file_stamp(self.path)
+
+    def replace(self, bank: dict) -> None:
+        with file_txn.file_lock(self.path):
+            bank.setdefault("meta", {})["rev"] = file_txn.get_rev(_read_json(self.path, {})) + 1
+            self._write(self.path, bank)
+            self._stamp = json_cache.file_stamp(self.path)
+
+    def transact(self, bank: dict, fn, default_factory):
+        """Locked read-modify-write on the freshest bank, retried on conflict -> (result, bank)."""
+        result, fresh = file_txn.transact_json(
+            self.path,
+            lambda: self.load(default_factory()),
+            fn,
+            self._write,
+        )
+        self._stamp = json_cache.file_stamp(self.path)
+        return result, fresh
+
+    # ---------- per-user index (locator = position counted from the oldest tx) ----------
+    def _index(self) -> tx_index.TxIndex:
+        return tx_index.get_index(f"json:{self.path}")
+
+    def _sync_index(self, idx: tx_index.TxIndex, txs: list) -> None:
+        newest = int(txs[0].get("seq", 0) or 0) if txs else 0
+        if idx.last_seq > newest or idx.position > len(txs):
+            idx.reset()
+        pending = []
+        for t in txs:  # newest-first: stop at what the index already has
+            if int(t.get("seq", 0) or 0) <= idx.last_seq:
+                break
+            pending.append(t)
+        base = len(txs) - len(pending)
+        for i, t in enumerate(reversed(pending)):
+            idx.add(t["seq"], t.get("user_id"), base + i)
+        idx.position = len(txs)
+
+    def page_txs(self, bank: dict, limit: int = 25, cursor: int | None = None, user_id: str | None = None):
+        """Newest-first page of txs (optionally one user's) -> (txs, next_cursor)."""
+        txs = bank.get("txs", []) or []
+        if txs and "seq" not in txs[0]:
+            # Not numbered yet (balance_index.catch_up does that) -> plain scan
+            rows = [t for t in txs if not user_id or t.get("user_id") == user_id]
+            return rows[: max(0, int(limit))], None
+
+        idx = self._index()
+        with idx.lock:
+            for _ in range(2):
+                self._sync_index(idx, txs)
+                hits, next_cursor = idx.page(user_id, limit, cursor)
+                out = []
+                for seq, pos in hits:
+                    i = len(txs) - 1 - pos
+                    t = txs[i] if 0 <= i < len(txs) else None
+                    if t is None or t.get("seq") != seq:
+                        out = None
+                        break
+                    out.append(t)
+                if out is not None:
+                    return out, next_cursor
+                idx.reset()  # file was rewritten under us; rebuild once
+        return [], None
+
+    def recent_txs(self, bank: dict, n: int = 10, user_id: str | None = None) -> list:
+        return self.page_txs(bank, n, user_id=user_id)[0]
+
+    def history_source(self, bank: dict):
+        """Thread-safe callable -> txs oldest-first, as of now."""
+        txs = list(bank.get("txs", []))
+        return lambda: reversed(txs)
+
+
+# ============================================================
+# SQLite backend (WAL, one row per tx, one row per user balance)
+# ============================================================
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS txs (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts          TEXT    NOT NULL,
+    user_id     TEXT    NOT NULL,
+    type        TEXT    NOT NULL,
+    amount      INTEGER NOT NULL,
+    description TEXT    NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS txs_user_seq ON txs (user_id, seq);
+
+CREATE TABLE IF NOT EXISTS balances (
+    user_id TEXT PRIMARY KEY,
+    balance INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS totals (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS docs (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _row_to_tx(row) -> dict:
+    return {
+        "seq": row[0],
+        "ts": row[1],
+        "user_id": row[2],
+        "type": row[3],
+        "amount": int(row[4]),
+        "description": row[5] or "",
+    }
+
+
+class _LazyBalances(dict):
+    """balances_by_user inside SqliteBankStore.transact(): a row is read the first time it's asked for."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        super().__init__()
+        self._conn = conn
+        self.touched = set()
+
+    def _fetch(self, uid) -> None:
+        if uid in self.touched:
+            return
+        self.touched.add(uid)
+        row = self._conn.execute("SELECT balance FROM balances WHERE user_id = ?", (uid,)).fetchone()
+        if row is not None:
+            dict.__setitem__(self, uid, int(row[0]))
+
+    def __getitem__(self, uid):
+        self._fetch(uid)
+        return dict.__getitem__(self, uid)
+
+    def __setitem__(self, uid, value) -> None:
+        self._fetch(uid)
+        dict.__setitem__(self, uid, value)
+
+    def __contains__(self, uid) -> bool:
+        self._fetch(uid)
+        return dict.__contains__(self, uid)
+
+    def get(self, uid, default=None):
+        self._fetch(uid)
+        return dict.get(self, uid, default)
+
+    def setdefault(self, uid, default=None):
+        self._fetch(uid)
+        return dict.setdefault(self, uid, default)
+
+
+class _TxnBank(dict):
+    """
+    Bank dict for one SqliteBankStore.transact(): totals are read up front, doc
+    keys on first access (falling back to `defaults`); changed_docs() reports
+    only the keys fn touched and changed.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, defaults: dict):
+        super().__init__()
+        self._conn = conn
+        self._defaults = defaults
+        self._orig = {}  # doc key -> its _dumps() when first read (_DELETED = not stored)
+        for key, value in conn.execute("SELECT key, value FROM totals"):
+            dict.__setitem__(self, key, int(value))
+        for k in TOTAL_KEYS:
+            dict.__setitem__(self, k, int(dict.get(self, k, 0) or 0))
+        dict.__setitem__(self, "balances_by_user", _LazyBalances(conn))
+        dict.__setitem__(self, "txs", [])
+
+    def _fetch(self, key) -> None:
+        if key in CORE_KEYS or key in self._orig:
+            return
+        self._orig[key] = _DELETED
+        row = self._conn.execute("SELECT value FROM docs WHERE key = ?", (key,)).fetchone()
+        try:
+            value = json.loads(row[0]) if row is not None else _DELETED
+        except Exception:
+            value = _DELETED
+        if value is not _DELETED:
+            dict.__setitem__(self, key, value)
+            self._orig[key] = _dumps(value)
+        elif key in self._defaults:
+            dict.__setitem__(self, key, self._defaults[key])  # not stored yet: written unless fn drops it
+
+    def __getitem__(self, key):
+        self._fetch(key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value) -> None:
+        self._fetch(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key) -> None:
+        self._fetch(key)
+        dict.__delitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        self._fetch(key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        self._fetch(key)
+        return dict.get(self, key, default)
+
+    def setdefault(self, key, default=None):
+        self._fetch(key)
+        return dict.setdefault(self, key, default)
+
+    def pop(self, key, *default):
+        self._fetch(key)
+        return dict.pop(self, key, *default)
+
+    def changed_docs(self) -> dict:
+        """{key: value} for touched doc keys whose content changed (value _DELETED = key removed)."""
+        out = {}
+        for key, orig in self._orig.items():
+            value = dict.get(self, key, _DELETED)
+            if (_DELETED if value is _DELETED else _dumps(value)) != orig:
+                out[key] = value
+        return out
+
+
+class SqliteBankStore:
+    """
+    Same bank dict in memory, but persistence is row-based:
+    - stage() queues a tx; save() writes the queued txs + their balance/total deltas
+      in ONE transaction (O(1) rows per tx, no full-file rewrite)
+    - spends re-check the balance inside the transaction, so a stale in-memory
+      bank can't push a user negative
+    - load() hydrates totals, balances_by_user and only the newest RECENT_WINDOW txs
+    - non-core bank keys are one docs row each, written only when that key changed
+    - transact() reads and writes only the rows its fn touches (see _TxnBank)
+    """
+
+    backend = "sqlite"
+    maintains_balances = True  # balances rows are written in the same transaction as the tx
+
+    def __init__(self, path: str, *, recent_window: int = RECENT_WINDOW):
+        self.path = path
+        self.recent_window = int(recent_window)
+        self._conn = None
+        self._staged = []
+        self._docs_json = {}  # doc key -> _dumps() of what the db holds
+
+    # ---------- connection ----------
+    def connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ---------- reads ----------
+    def load(self, default: dict) -> dict:
+        conn = self.connect()
+        bank = dict(default)
+
+        for key, value in conn.execute("SELECT key, value FROM docs"):
+            try:
+                bank[key] = json.loads(value)
+            except Exception:
+                pass
+
+        for key, value in conn.execute("SELECT key, value FROM totals"):
+            bank[key] = int(value)
+        for k in TOTAL_KEYS:
+            bank[k] = int(bank.get(k, 0) or 0)
+
+        bank["balances_by_user"] = {
+            uid: int(bal) for uid, bal in conn.execute("SELECT user_id, balance FROM balances")
+        }
+        bank["txs"] = self._query_txs(self.recent_window)
+
+        self._docs_json = {k: _dumps(v) for k, v in _bank_docs(bank).items()}
+        self._staged = []
+        return bank
+
+    def _query_txs(self, n: int, user_id: str | None = None) -> list:
+        conn = self.connect()
+        cols = "seq, ts, user_id, type, amount, description"
+        if user_id:
+            rows = conn.execute(
+                f"SELECT {cols} FROM txs WHERE user_id = ? ORDER BY seq DESC LIMIT ?",
+                (user_id, int(n)),
+            )
+        else:
+            rows = conn.execute(f"SELECT {cols} FROM txs ORDER BY seq DESC LIMIT ?", (int(n),))
+        return [_row_to_tx(r) for r in rows]
+
+    def recent_txs(self, bank: dict, n: int = 10, user_id: str | None = None) -> list:
+        n = max(0, int(n))
+        if not user_id and n <= len(bank.get("txs", [])):
+            return bank["txs"][:n]
+        return self._query_txs(n, user_id)
+
+    def page_txs(self, bank: dict, limit: int = 25, cursor: int | None = None, user_id: str | None = None):
+        """Newest-first page of txs (optionally one user's) -> (txs, next_cursor). Uses txs_user_seq."""
+        limit = max(0, int(limit))
+        where, args = [], []
+        if user_id:
+            where.append("user_id = ?")
+            args.append(user_id)
+        if cursor is not None:
+            where.append("seq < ?")
+            args.append(int(cursor))
+        sql = "SELECT seq, ts, user_id, type, amount, description FROM txs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY seq DESC LIMIT ?"
+        rows = [_row_to_tx(r) for r in self.connect().execute(sql, (*args, limit + 1))]
+        next_cursor = rows[limit - 1]["seq"] if len(rows) > limit and limit > 0 else None
+        return rows[:limit], next_cursor
+
+    def get_user_balance(self, user_id: str) -> int:
+        row = self.connect().execute("SELECT balance FROM balances WHERE user_id = ?", (user_id,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def history_source(self, bank: dict):
+        """Thread-safe callable -> txs oldest-first, up to the newest tx loaded into bank."""
+        txs = bank.get("txs") or []
+        upto = int(txs[0].get("seq", 0) or 0) if txs else 0
+        path = self.path
+
+        def _iter():
+            conn = sqlite3.connect(path, timeout=10)
+            try:
+                rows = conn.execute(
+                    "SELECT seq, ts, user_id, type, amount, description FROM txs WHERE seq <= ? ORDER BY seq",
+                    (upto,),
+                )
+                for r in rows:
+                    yield _row_to_tx(r)
+            finally:
+                conn.close()
+
+        return _iter
+
+    # ---------- writes ----------
+    def stage(self, bank: dict, tx: dict) -> None:
+        txs = bank.setdefault("txs", [])
+        txs.insert(0, tx)
+        del txs[self.recent_window:]
+        self._staged.append(tx)
+
+    def save(self, bank: dict) -> None:
+        staged, self._staged = self._staged, []
+        docs_json = {k: _dumps(v) for k, v in _bank_docs(bank).items()}
+        changed = {k: bank[k] for k, v in docs_json.items() if self._docs_json.get(k) != v}
+        changed.update({k: _DELETED for k in self._docs_json if k not in docs_json})
+        if not staged and not changed:
+            return
+
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for tx in staged:
+                self._apply_tx(conn, tx)
+            self._write_doc_changes(conn, changed)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._docs_json = docs_json
+
+    def transact(self, bank: dict, fn, default_factory):
+        """
+        fn runs inside BEGIN IMMEDIATE on a _TxnBank (totals, plus the balance rows
+        and doc keys fn asks for), so the db is the arbiter between concurrent
+        writers. Writes the staged txs and the changed doc keys, then merges the
+        touched rows into `bank` -> (result, bank).
+        """
+        conn = self.connect()
+        self._staged = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            work = _TxnBank(conn, _bank_docs(default_factory()))
+            result = fn(work)
+            staged, self._staged = self._staged, []
+            for tx in staged:
+                self._apply_tx(conn, tx)
+            changed = work.changed_docs()
+            self._write_doc_changes(conn, changed)
+            conn.execute("COMMIT")
+        except BaseException:
+            self._staged = []
+            conn.execute("ROLLBACK")
+            raise
+
+        for key, value in conn.execute("SELECT key, value FROM totals"):
+            bank[key] = int(value)
+        balances = bank.get("balances_by_user")
+        if balances is None:
+            balances = bank["balances_by_user"] = {}
+        uids = dict.get(work, "balances_by_user").touched | {tx.get("user_id") or "user-1" for tx in staged}
+        for uid in uids:
+            row = conn.execute("SELECT balance FROM balances WHERE user_id = ?", (uid,)).fetchone()
+            if row is not None:
+                balances[uid] = int(row[0])
+        for key, value in changed.items():
+            if value is _DELETED:
+                bank.pop(key, None)
+                self._docs_json.pop(key, None)
+            else:
+                bank[key] = value
+                self._docs_json[key] = _dumps(value)
+        bank["txs"] = (dict.get(work, "txs") + list(bank.get("txs") or []))[: self.recent_window]
+        return result, bank
+
+    def _apply_tx(self, conn: sqlite3.Connection, tx: dict) -> None:
+        d = tx_deltas(tx)
+        uid = tx.get("user_id") or "user-1"
+        delta = int(d.get("user", 0))
+
+        if delta < 0:
+            cur = conn.execute(
+                "UPDATE balances SET balance = balance + ? WHERE user_id = ? AND balance >= ?",
+                (delta, uid, -delta),
+            )
+            if cur.rowcount == 0:
+                raise ValueError(f"Insufficient personal balance for {uid}.")
+        elif delta > 0:
+            conn.execute(
+                "INSERT INTO balances (user_id, balance) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET balance = balance + excluded.balance",
+                (uid, delta),
+            )
+
+        for key in TOTAL_KEYS:
+            if d.get(key):
+                conn.execute(
+                    "INSERT INTO totals (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+                    (key, int(d[key])),
+                )
+
+        cur = conn.execute(
+            "INSERT INTO txs (ts, user_id, type, amount, description) VALUES (?, ?, ?, ?, ?)",
+            (tx.get("ts") or _now_iso(), uid, tx.get("type", ""), int(tx.get("amount", 0)), tx.get("description", "")),
+        )
+        tx["seq"] = cur.lastrowid
+
+    def _write_doc_changes(self, conn: sqlite3.Connection, changed: dict) -> None:
+        # changed: {key: value}; _DELETED drops the key's row
+        conn.executemany("DELETE FROM docs WHERE key = ?", [(k,) for k, v in changed.items() if v is _DELETED])
+        conn.executemany(
+            "INSERT INTO docs (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [(k, json.dumps(v, ensure_ascii=False, default=str)) for k, v in changed.items() if v is not _DELETED],
+        )
+
+    def replace(self, bank: dict) -> None:
+        """
+        Overwrite the whole store from a bank dict (admin reset / JSON import).
+        txs in the dict are newest-first (same as careon_bank_v2.json).
+        """
+        self._staged = []
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM txs")
+            conn.execute("DELETE FROM balances")
+            conn.execute("DELETE FROM totals")
+            conn.executemany(
+                "INSERT INTO txs (ts, user_id, type, amount, description) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        t.get("ts") or _now_iso(),
+                        t.get("user_id") or "user-1",
+                        t.get("type", ""),
+                        int(t.get("amount", 0)),
+                        t.get("description", "") or "",
+                    )
+                    for t in reversed(bank.get("txs", []) or [])
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO balances (user_id, balance) VALUES (?, ?)",
+                [(uid, int(bal)) for uid, bal in (bank.get("balances_by_user") or {}).items()],
+            )
+            conn.executemany(
+                "INSERT INTO totals (key, value) VALUES (?, ?)",
+                [(k, int(bank.get(k, 0) or 0)) for k in TOTAL_KEYS],
+            )
+            conn.execute("DELETE FROM docs")
+            self._write_doc_changes(conn, _bank_docs(bank))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._docs_json = {k: _dumps(v) for k, v in _bank_docs(bank).items()}
+
+
+# ============================================================
+# Journal backend (append-only JSON lines + compacted snapshots)
+# ============================================================
+# fsync batching is process-wide (store objects are rebuilt on every Streamlit rerun)
+_FSYNC_STATE = {}  # journal path -> {"pending": int, "last": float}
+
+
+class JournalBankStore:
+    """
+    Append-only bank:
+    - save() appends one JSON line per staged tx (plus a line per changed doc key);
+      fsync is batched (FSYNC_EVERY txs or FSYNC_SECONDS)
+    - every SNAPSHOT_EVERY txs a compacted snapshot (totals, balances_by_user,
+      docs, newest txs) is written with the journal byte offset it covers
+    - load() = snapshot + replay of the journal tail after that offset,
+      so cold start doesn't depend on history length
+    """
+
+    backend = "journal"
+    maintains_balances = True  # snapshot seq is the checkpoint; load replays only the tail
+
+    def __init__(self, journal_path: str, snapshot_path: str, *, recent_window: int = RECENT_WINDOW):
+        self.journal_path = journal_path
+        self.snapshot_path = snapshot_path
+        self.recent_window = int(recent_window)
+        self._staged = []
+        self._offset = 0  # journal bytes already reflected in memory
+        self._seq = 0  # last tx seq seen
+        self._snapshot_seq = 0
+        self._docs_json = {}
+
+    # ---------- reads ----------
+    def load(self, default: dict) -> dict:
+        snap = _read_json(self.snapshot_path, None)
+        if isinstance(snap, dict) and isinstance(snap.get("bank"), dict):
+            bank = dict(default)
+            bank.update(snap["bank"])
+            self._offset = int(snap.get("journal_offset", 0))
+            self._seq = self._snapshot_seq = int(snap.get("seq", 0))
+        else:
+            bank = dict(default)
+            bank["txs"] = []
+            self._offset = self._seq = self._snapshot_seq = 0
+
+        for k in TOTAL_KEYS:
+            bank[k] = int(bank.get(k, 0) or 0)
+        bank.setdefault("balances_by_user", {})
+        bank.setdefault("txs", [])
+
+        self._replay_tail(bank)
+        self._docs_json = {k: _dumps(v) for k, v in _bank_docs(bank).items()}
+        self._staged = []
+        return bank
+
+    def _replay_tail(self, bank: dict) -> None:
+        # Applies journal records written after self._offset (by us before a restart, or by
+        # another process). A torn last line (crash mid-append) is ignored until completed.
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._offset += len(line)
+                try:
+                    rec = json.loads(line)
+                except Exception:
+                    continue
+                self._apply_record(bank, rec)
+
+    def _apply_record(self, bank: dict, rec: dict) -> None:
+        op = rec.get("op")
+        if op == "tx":
+            tx = {k: rec[k] for k in ("seq", "ts", "user_id", "type", "amount", "description") if k in rec}
+            apply_tx(bank, tx)
+            self._push_recent(bank, tx)
+            self._seq = max(self._seq, int(rec.get("seq", 0)))
+        elif op == "doc":
+            if rec.get("delete"):
+                bank.pop(rec.get("key"), None)
+            else:
+                bank[rec.get("key")] = rec.get("value")
+
+    def _push_recent(self, bank: dict, tx: dict) -> None:
+        txs = bank.setdefault("txs", [])
+        txs.insert(0, tx)
+        del txs[self.recent_window:]
+
+    # ---------- per-user index (locator = byte offset of the tx line) ----------
+    def _index(self) -> tx_index.TxIndex:
+        return tx_index.get_index(f"journal:{self.journal_path}")
+
+    def _sync_index(self, idx: tx_index.TxIndex) -> None:
+        if idx.last_seq > self._seq or idx.position > self._offset:
+            idx.reset()
+        if idx.position >= self._offset or not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as f:
+            f.seek(idx.position)
+            pos = idx.position
+            for line in f:
+                if pos + len(line) > self._offset:
+                    break
+                if line.startswith(b'{"op":"tx"'):
+                    try:
+                        rec = json.loads(line)
+                        idx.add(rec["seq"], rec.get("user_id"), pos)
+                    except Exception:
+                        pass
+                pos += len(line)
+            idx.position = pos
+
+    def _read_at(self, f, offset: int, seq: int) -> dict | None:
+        f.seek(offset)
+        try:
+            rec = json.loads(f.readline())
+        except Exception:
+            return None
+        if rec.get("op") != "tx" or rec.get("seq") != seq:
+            return None
+        return {k: rec[k] for k in ("seq", "ts", "user_id", "type", "amount", "description") if k in rec}
+
+    def page_txs(self, bank: dict, limit: int = 25, cursor: int | None = None, user_id: str | None = None):
+        """Newest-first page of txs (optionally one user's) -> (txs, next_cursor)."""
+        if not os.path.exists(self.journal_path):
+            return [], None
+        idx = self._index()
+        with idx.lock:
+            for _ in range(2):
+                self._sync_index(idx)
+                hits, next_cursor = idx.page(user_id, limit, cursor)
+                with open(self.journal_path, "rb") as f:
+                    out = [self._read_at(f, off, seq) for seq, off in hits]
+                if None not in out:
+                    return out, next_cursor
+                idx.reset()  # journal was rewritten (replace); rebuild once
+        return [], None
+
+    def recent_txs(self, bank: dict, n: int = 10, user_id: str | None = None) -> list:
+        if not user_id:
+            return bank.get("txs", [])[: max(0, int(n))]
+        return self.page_txs(bank, n, user_id=user_id)[0]
+
+    def history_source(self, bank: dict):
+        """Thread-safe callable -> txs oldest-first, up to the journal offset loaded into bank."""
+        path, upto = self.journal_path, self._offset
+
+        def _iter():
+            if not os.path.exists(path):
+                return
+            with open(path, "rb") as f:
+                pos = 0
+                for line in f:
+                    pos += len(line)
+                    if pos > upto:
+                        break
+                    try:
+                        rec = json.loads(line)
+                    except Exception:
+                        continue
+                    if rec.get("op") == "tx":
+                        yield rec
+
+        return _iter
+
+    # ---------- writes ----------
+    def stage(self, bank: dict, tx: dict) -> None:
+        self._push_recent(bank, tx)
+        self._staged.append(tx)
+
+    def transact(self, bank: dict, fn, default_factory):
+        """Under the journal lock: catch up on the tail, run fn, append -> (result, bank)."""
+        with file_txn.file_lock(self.journal_path):
+            self._replay_tail(bank)
+            result = fn(bank)
+            self.save(bank)
+        return result, bank
+
+    def save(self, bank: dict) -> None:
+        with file_txn.file_lock(self.journal_path):
+            self._save_locked(bank)
+
+    def _save_locked(self, bank: dict) -> None:
+        staged, self._staged = self._staged, []
+
+        # Catch up on records appended by other processes before ours go in
+        staged_ids = {id(t) for t in staged}
+        bank["txs"] = [t for t in bank.get("txs", []) if id(t) not in staged_ids]
+        self._replay_tail(bank)
+
+        lines = []
+        for tx in staged:
+            self._seq += 1
+            tx["seq"] = self._seq
+            self._push_recent(bank, tx)
+            lines.append({"op": "tx", **tx})
+
+        docs_json = {k: _dumps(v) for k, v in _bank_docs(bank).items()}
+        for k, v in docs_json.items():
+            if self._docs_json.get(k) != v:
+                lines.append({"op": "doc", "key": k, "value": bank[k]})
+        for k in self._docs_json:
+            if k not in docs_json:
+                lines.append({"op": "doc", "key": k, "delete": True})
+        self._docs_json = docs_json
+
+        if not lines:
+            return
+
+        encoded = [(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8") for r in lines]
+        data = b"".join(encoded)
+        d = os.path.dirname(self.journal_path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > self._offset:
+            # Drop a torn tail so our first line doesn't get glued onto it
+            os.truncate(self.journal_path, self._offset)
+        with open(self.journal_path, "ab") as f:
+            start = f.tell()
+            f.write(data)
+            f.flush()
+            self._maybe_fsync(f, len(staged))
+            self._offset = f.tell()
+
+        idx = self._index()
+        with idx.lock:
+            if idx.position == start:
+                pos = start
+                for rec, raw in zip(lines, encoded):
+                    if rec["op"] == "tx":
+                        idx.add(rec["seq"], rec.get("user_id"), pos)
+                    pos += len(raw)
+                idx.position = pos
+
+        if self._seq - self._snapshot_seq >= SNAPSHOT_EVERY:
+            self.snapshot(bank)
+
+    def _maybe_fsync(self, f, n_txs: int) -> None:
+        state = _FSYNC_STATE.setdefault(self.journal_path, {"pending": 0, "last": time.monotonic()})
+        state["pending"] += max(1, n_txs)
+        now = time.monotonic()
+        if state["pending"] >= FSYNC_EVERY or now - state["last"] >= FSYNC_SECONDS:
+            os.fsync(f.fileno())
+            state["pending"] = 0
+            state["last"] = now
+
+    def snapshot(self, bank: dict) -> None:
+        """Write a compacted snapshot covering the journal up to the current offset."""
+        snap_bank = {k: v for k, v in bank.items() if k != "txs"}
+        snap_bank["txs"] = list(bank.get("txs", [])[: self.recent_window])
+        _write_json(
+            self.snapshot_path,
+            {
+                "journal_offset": self._offset,
+                "seq": self._seq,
+                "created_at": _now_iso(),
+                "bank": snap_bank,
+            },
+        )
+        self._snapshot_seq = self._seq
+
+    def replace(self, bank: dict) -> None:
+        """
+        Overwrite the whole store from a bank dict (admin reset / JSON import):
+        the journal is rewritten from bank["txs"] (newest-first) and snapshotted.
+        """
+        with file_txn.file_lock(self.journal_path):
+            self._replace_locked(bank)
+
+    def _replace_locked(self, bank: dict) -> None:
+        self._staged = []
+        self._seq = 0
+        lines = []
+        for tx in reversed(bank.get("txs", []) or []):
+            self._seq += 1
+            tx["seq"] = self._seq
+            lines.append(json.dumps({"op": "tx", **tx}, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+        d = os.path.dirname(self.journal_path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = self.journal_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+            self._offset = f.tell()
+        os.replace(tmp, self.journal_path)
+        idx = self._index()
+        with idx.lock:
+            idx.reset()
+
+        bank["txs"] = list(bank.get("txs", [])[: self.recent_window])
+        self._docs_json = {k: _dumps(v) for k, v in _bank_docs(bank).items()}
+        self.snapshot(bank)
+
+
+# ============================================================
+# Factory + one-shot importer
+# ============================================================
+def journal_paths(json_path: str) -> tuple[str, str]:
+    base = os.path.splitext(json_path)[0]
+    return base + ".journal.jsonl", base + ".snapshot.json"
+
+
+def open_bank_store(backend: str, *, json_path: str, db_path: str, load_fn=None, save_fn=None):
+    backend = (backend or DEFAULT_BACKEND).strip().lower()
+    if backend == "sqlite":
+        return SqliteBankStore(db_path)
+    if backend == "journal":
+        return JournalBankStore(*journal_paths(json_path))
+    if backend == "json":
+        return JsonBankStore(json_path, load_fn=load_fn, save_fn=save_fn)
+    raise ValueError(f"Unknown bank backend: {backend}")
+
+
+def import_json_bank(json_path: str, db_path: str, backend: str = "sqlite") -> dict:
+    """
+    One-shot migration: careon_bank_v2.json -> SQLite db (or journal + snapshot).
+    Replaces whatever the target held. Returns a small summary.
+    """
+    bank = _read_json(json_path, None)
+    if not isinstance(bank, dict):
+        raise ValueError(f"Could not read bank JSON: {json_path}")
+    n_txs = len(bank.get("txs", []) or [])
+
+    if backend == "journal":
+        store = JournalBankStore(*journal_paths(db_path))
+        store.replace(bank)
+    else:
+        store = SqliteBankStore(db_path)
+        try:
+            store.replace(bank)
+        finally:
+            store.close()
+
+    return {
+        "txs": n_txs,
+        "users": len(bank.get("balances_by_user", {}) or {}),
+        "db_path": db_path,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import careon_bank_v2.json into a SQLite or journal bank store.")
+    parser.add_argument("json_path", nargs="?", default="careon_bank_v2.json")
+    parser.add_argument("db_path", nargs="?", default="careon_bank_v2.db", help="db file (sqlite) or base path (journal)")
+    parser.add_argument("--backend", choices=["sqlite", "journal"], default="sqlite")
+    args = parser.parse_args()
+
+    summary = import_json_bank(args.json_path, args.db_path, backend=args.backend)
+    print(f"Imported {summary['txs']} txs / {summary['users']} balances -> {summary['db_path']}")
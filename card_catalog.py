@@ -0,0 +1,100 @@
+# card_catalog.py
+import json
+import threading
+
+import card_search
+import json_cache
+
+
+# Compiled view of assets/manifests/cards_manifest.json, built once per file
+# (mtime, size) and shared by every session:
+#   cards:      flat list, each card a copy with "_set_name" (and "_key") added
+#   by_key:     card key -> card
+#   by_set / by_rarity / by_tag: value -> sorted positions in `cards`
+# filter() answers the Cards view filters with set intersections instead of a
+# Python predicate over every card; search_index() adds full-text search
+# (card_search), built on first use. Cards are shared: treat them as read-only.
+
+
+def card_key(card: dict) -> str:
+    return card.get("card_id") or f"{card.get('_set_name', 'set')}-{card.get('name', 'card')}"
+
+
+class Catalog:
+    def __init__(self, manifest: dict, error: str | None = None):
+        self.error = error
+        self.sets = manifest.get("sets", []) or []
+        cards, by_key, by_set, by_rarity, by_tag = [], {}, {}, {}, {}
+        for s in self.sets:
+            set_name = s.get("set_name", "Unnamed Set")
+            for card in s.get("cards", []) or []:
+                c = dict(card)
+                c["_set_name"] = set_name
+                c["_key"] = card_key(c)
+                pos = len(cards)
+                cards.append(c)
+                by_key.setdefault(c["_key"], c)
+                by_set.setdefault(set_name, []).append(pos)
+                rarity = (c.get("rarity") or "").strip()
+                if rarity:
+                    by_rarity.setdefault(rarity, []).append(pos)
+                for tag in c.get("tags") or []:
+                    by_tag.setdefault(str(tag).strip().lower(), []).append(pos)
+        self.cards = cards
+        self.by_key = by_key
+        self.by_set = by_set
+        self.by_rarity = by_rarity
+        self.by_tag = by_tag
+        self.set_options = sorted(by_set)
+        self.rarity_options = sorted(by_rarity)
+        self.tag_options = sorted(t for t in by_tag if t)
+        self._search = None
+        self._search_lock = threading.Lock()
+
+    def search_index(self) -> card_search.SearchIndex:
+        with self._search_lock:
+            if self._search is None:
+                self._search = card_search.SearchIndex(self.cards)
+            return self._search
+
+    def get(self, key: str | None) -> dict | None:
+        return self.by_key.get(key) if key else None
+
+    def filter(self, set_name: str | None = None, rarity: str | None = None, tag: str | None = None) -> list:
+        """Sorted positions of cards matching every given filter (None = any)."""
+        postings = []
+        if set_name is not None:
+            postings.append(self.by_set.get(set_name, []))
+        if rarity is not None:
+            postings.append(self.by_rarity.get(rarity, []))
+        if tag is not None:
+            postings.append(self.by_tag.get(str(tag).strip().lower(), []))
+        if not postings:
+            return list(range(len(self.cards)))
+        postings.sort(key=len)
+        hits = set(postings[0])
+        for p in postings[1:]:
+            hits.intersection_update(p)
+            if not hits:
+                break
+        return sorted(hits)
+
+
+_CATALOGS = {}  # path -> (stamp, Catalog)
+_LOCK = threading.Lock()
+
+
+def get_catalog(path: str) -> Catalog:
+    stamp = json_cache.file_stamp(path)
+    with _LOCK:
+        hit = _CATALOGS.get(path)
+        if hit is not None and hit[0] == stamp and stamp is not None:
+            return hit[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            catalog = Catalog(json.load(f))
+    except Exception as e:
+        return Catalog({"version": "v1", "sets": []}, error=str(e))  # not cached: retried next rerun
+    with _LOCK:
+        _CATALOGS[path] = (stamp, catalog)
+    return catalog
@@ -0,0 +1,212 @@
+# card_search.py
+import bisect
+import re
+import time
+
+
+# In-process full-text search over the compiled card list (card_catalog).
+#   words:    word -> {position: field weight}      (name 3, tags 2, text 1)
+#   trigrams: trigram -> set of words in the vocabulary
+# A query word matches vocabulary words exactly (1.0), by prefix (0.8) or, for
+# typos, fuzzily (up to 0.6): words sharing trigrams with it are kept if their
+# trigram Jaccard similarity is >= MIN_SIMILARITY or they are within
+# max_typos() edits (swaps count as one edit, which trigrams alone miss).
+# Every query word must match (AND); cards are ranked by the summed
+# weight x match score.
+
+FIELD_WEIGHTS = {"name": 3.0, "tags": 2.0, "text": 1.0}
+MIN_SIMILARITY = 0.4
+PREFIX_SCORE = 0.8
+FUZZY_SCORE = 0.6
+MAX_EXPANSIONS = 50  # vocabulary words considered per query word
+
+_WORD_RE = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text) -> list:
+    return _WORD_RE.findall(str(text or "").lower())
+
+
+def max_typos(word: str) -> int:
+    return 0 if len(word) < 4 else 1 if len(word) < 8 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps = 1); > limit once it can't be <= limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def trigrams(word: str) -> set:
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    def __init__(self, cards: list):
+        words = {}
+        for pos, card in enumerate(cards):
+            fields = {
+                "name": card.get("name"),
+                "tags": " ".join(str(t) for t in (card.get("tags") or [])),
+                "text": card.get("text"),
+            }
+            for field, value in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for w in tokenize(value):
+                    postings = words.setdefault(w, {})
+                    if postings.get(pos, 0.0) < weight:
+                        postings[pos] = weight
+        grams = {}
+        for w in words:
+            for g in trigrams(w):
+                grams.setdefault(g, set()).add(w)
+        self.words = words
+        self.trigrams = grams
+        self.vocab = sorted(words)
+        self.n = len(cards)
+
+    def _expand(self, q: str) -> dict:
+        """Vocabulary words matching query word q -> match score."""
+        out = {}
+        if q in self.words:
+            out[q] = 1.0
+        i = bisect.bisect_left(self.vocab, q)
+        while i < len(self.vocab) and len(out) < MAX_EXPANSIONS and self.vocab[i].startswith(q):
+            out.setdefault(self.vocab[i], PREFIX_SCORE)
+            i += 1
+        if len(q) >= 3:
+            q_grams = trigrams(q)
+            typos = max_typos(q)
+            counts = {}
+            for g in q_grams:
+                for w in self.trigrams.get(g, ()):
+                    counts[w] = counts.get(w, 0) + 1
+            fuzzy = []
+            for w, common in counts.items():
+                if w in out or common < 2:
+                    continue
+                sim = common / (len(q_grams) + len(w) + 1 - common)  # |w grams| = len(w) + 1
+                if sim < MIN_SIMILARITY and typos:
+                    d = edit_distance(q, w, typos)
+                    if d <= typos:
+                        sim = max(sim, 1.0 - d / len(q))
+                if sim >= MIN_SIMILARITY:
+                    fuzzy.append((sim, w))
+            fuzzy.sort(reverse=True)
+            for sim, w in fuzzy[: max(0, MAX_EXPANSIONS - len(out))]:
+                out[w] = FUZZY_SCORE * sim
+        return out
+
+    def search(self, query: str, limit: int | None = None) -> list:
+        """[(position, score)] best first; every query word must match."""
+        q_words = tokenize(query)
+        if not q_words:
+            return []
+        scores = None
+        for q in dict.fromkeys(q_words):
+            word_scores = {}
+            for w, match in self._expand(q).items():
+                for pos, weight in self.words[w].items():
+                    s = weight * match
+                    if s > word_scores.get(pos, 0.0):
+                        word_scores[pos] = s
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {p: s + word_scores[p] for p, s in scores.items() if p in word_scores}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked[:limit] if limit else ranked
+
+
+# ============================================================
+# Benchmark: python card_search.py [--sizes 10000 100000]
+# ============================================================
+_SYLLABLES = ["ka", "ri", "mo", "zen", "ith", "sol", "ara", "vel", "nox", "lu", "cy", "tor", "qui", "sta", "ber"]
+_TAGS = ["acuity", "valor", "variety", "intro", "zenith", "aurora", "ember", "tide", "echo", "prism"]
+
+
+def synthetic_cards(n: int, seed: int = 7) -> list:
+    import random
+
+    rng = random.Random(seed)
+
+    def word():
+        return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+    return [
+        {
+            "card_id": f"syn-{i:06d}",
+            "name": f"{word().title()} {word().title()}",
+            "tags": rng.sample(_TAGS, rng.randint(1, 3)),
+            "text": " ".join(word() for _ in range(rng.randint(4, 10))),
+        }
+        for i in range(n)
+    ]
+
+
+def benchmark(sizes=(10_000, 100_000), repeats: int = 50) -> list:
+    rows = []
+    for n in sizes:
+        cards = synthetic_cards(n)
+        t0 = time.perf_counter()
+        idx = SearchIndex(cards)
+        build = time.perf_counter() - t0
+
+        sample = cards[n // 2]
+        name_word = tokenize(sample["name"])[0]
+        queries = {
+            "exact": name_word,
+            "prefix": name_word[:4],
+            "typo": name_word[:-2] + name_word[-1] + name_word[-2] if len(name_word) > 3 else name_word,
+            "two words": f"{sample['tags'][0]} {name_word[:3]}",
+        }
+        for label, q in queries.items():
+            times = []
+            hits = 0
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                hits = len(idx.search(q, limit=50))
+                times.append(time.perf_counter() - t0)
+            times.sort()
+            rows.append(
+                {
+                    "cards": n,
+                    "build_s": round(build, 2),
+                    "query": label,
+                    "q": q,
+                    "hits": hits,
+                    "p50_ms": round(times[len(times) // 2] * 1000, 2),
+                    "p95_ms": round(times[int(len(times) * 0.95) - 1] * 1000, 2),
+                }
+            )
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Card search benchmark on synthetic libraries.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    for r in benchmark(args.sizes, args.repeats):
+        print(
+            f"{r['cards']:>7} cards (build {r['build_s']}s)  {r['query']:<10} {r['q']!r:<18} "
+            f"{r['hits']:>3} hits  p50 {r['p50_ms']} ms  p95 {r['p95_ms']} ms"
+        )
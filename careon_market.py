@@ -4,6 +4,9 @@ from datetime import datetime, timezone
 
 import streamlit as st
 
+import bank_store
+import style_registry
+
 
 C_LINE = "Ȼ"  # Careon currency symbol
 
@@ -12,6 +15,170 @@ C_LINE = "Ȼ"  # Careon currency symbol
 DEP_RE = re.compile(r"^DEP-(\d{1,5})-([A-Z0-9]{4,16})$", re.IGNORECASE)
 
 
+_MARKET_CSS = """
+/* ========== MARKET CONTAINER ========== */
+.market-palace {
+    background: linear-gradient(
+        135deg,
+        rgba(180, 130, 255, 0.08) 0%,
+        rgba(120, 220, 210, 0.06) 100%
+    );
+    border: 1px solid rgba(255, 255, 255, 0.15);
+    border-radius: 24px;
+    padding: 1.8rem 2rem;
+    margin: 0.75rem 0 1.2rem 0;
+    backdrop-filter: blur(16px);
+    box-shadow:
+        0 12px 48px rgba(0, 0, 0, 0.25),
+        inset 0 1px 0 rgba(255, 255, 255, 0.10);
+    position: relative;
+    overflow: hidden;
+}
+
+/* Ambient light effect */
+.market-palace::before {
+    content: '';
+    position: absolute;
+    top: -50%;
+    left: -50%;
+    width: 200%;
+    height: 200%;
+    background: radial-gradient(
+        circle,
+        rgba(246, 193, 119, 0.08) 0%,
+        transparent 50%
+    );
+    animation: ambientRotate 20s linear infinite;
+    pointer-events: none;
+}
+
+@keyframes ambientRotate {
+    from { transform: rotate(0deg); }
+    to { transform: rotate(360deg); }
+}
+
+/* Title */
+.market-title {
+    font-size: 1.65rem;
+    font-weight: 900;
+    letter-spacing: 0.15em;
+    text-align: center;
+    background: linear-gradient(
+        135deg,
+        #ffd27a 0%,
+        #b482ff 50%,
+        #78dcd2 100%
+    );
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+    margin-bottom: 1.0rem;
+    filter: drop-shadow(0 2px 8px rgba(246,193,119,0.3));
+    position: relative;
+    z-index: 2;
+}
+
+/* Balance display */
+.balance-shrine {
+    background: rgba(255, 255, 255, 0.06);
+    border: 1px solid rgba(246, 193, 119, 0.25);
+    border-radius: 18px;
+    padding: 1.05rem;
+    margin-bottom: 1.25rem;
+    text-align: center;
+    box-shadow:
+        0 0 24px rgba(246, 193, 119, 0.15),
+        inset 0 1px 0 rgba(255, 255, 255, 0.08);
+    position: relative;
+    z-index: 2;
+}
+
+.balance-label {
+    font-size: 0.85rem;
+    color: rgba(245, 245, 247, 0.75);
+    letter-spacing: 0.08em;
+    text-transform: uppercase;
+    margin-bottom: 0.35rem;
+}
+
+.balance-amount {
+    font-size: 2.15rem;
+    font-weight: 950;
+    color: #ffd27a;
+    letter-spacing: 0.08em;
+    text-shadow:
+        0 0 24px rgba(246, 193, 119, 0.60),
+        0 2px 4px rgba(0, 0, 0, 0.40);
+}
+
+/* Package cards */
+.package-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(160px, 1fr));
+    gap: 1rem;
+    margin: 1.0rem 0 0.6rem 0;
+    position: relative;
+    z-index: 2;
+}
+
+.package-card {
+    background: rgba(255, 255, 255, 0.04);
+    border: 1px solid rgba(255, 255, 255, 0.12);
+    border-radius: 16px;
+    padding: 1.05rem 0.95rem;
+    text-align: center;
+    transition: all 0.25s ease;
+    cursor: default;
+}
+
+.package-card:hover {
+    background: rgba(255, 255, 255, 0.08);
+    border-color: rgba(246, 193, 119, 0.40);
+    transform: translateY(-3px);
+    box-shadow: 0 8px 24px rgba(246, 193, 119, 0.25);
+}
+
+.package-amount {
+    font-size: 1.55rem;
+    font-weight: 900;
+    color: #ffd27a;
+    margin-bottom: 0.2rem;
+}
+
+.package-price {
+    font-size: 0.85rem;
+    color: rgba(245, 245, 247, 0.72);
+}
+
+/* Divider */
+.market-divider {
+    height: 1px;
+    background: linear-gradient(
+        90deg,
+        transparent,
+        rgba(255, 255, 255, 0.15) 50%,
+        transparent
+    );
+    margin: 1.25rem 0;
+    position: relative;
+    z-index: 2;
+}
+
+/* Info */
+.market-info {
+    text-align: center;
+    font-size: 0.88rem;
+    color: rgba(245, 245, 247, 0.70);
+    line-height: 1.5;
+    margin-top: 0.9rem;
+    position: relative;
+    z-index: 2;
+}
+"""
+
+style_registry.register("careon_market", lambda _key: _MARKET_CSS)
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
@@ -68,12 +235,63 @@ def _fallback_deposit_like_main_app(bank: dict, user_id: str, amount: int, descr
     return tx
 
 
+def _fallback_redeem_like_main_app(bank: dict, user_id: str, amount: int, description: str = ""):
+    """
+    Fallback code redemption matching the main app's redeem():
+    - One "redeem" tx for the full code value
+    - 95% to the user (global + personal + total_earned), 5% to sld_network_fund
+    """
+    amount = int(amount)
+    if amount <= 0:
+        raise ValueError("Redemption amount must be greater than 0.")
+    user_share, fund_share = bank_store.redemption_split(amount)
+
+    bank["balance"] = int(bank.get("balance", 0)) + user_share
+    _set_user_balance(bank, user_id, _get_user_balance(bank, user_id) + user_share)
+    bank["total_earned"] = int(bank.get("total_earned", 0)) + user_share
+    bank["sld_network_fund"] = int(bank.get("sld_network_fund", 0)) + fund_share
+
+    tx = {
+        "ts": _now_iso(),
+        "user_id": user_id,
+        "type": "redeem",
+        "amount": amount,
+        "description": (description or "").strip(),
+    }
+    bank.setdefault("txs", [])
+    bank["txs"].insert(0, tx)
+    bank.setdefault("meta", {})
+    bank["meta"]["updated_at"] = _now_iso()
+    return tx
+
+
+def _claim_code(bank: dict, used_codes, code: str, user_id: str) -> bool:
+    # O(1) duplicate check + claim. Store-backed when available, legacy list otherwise.
+    if used_codes is not None:
+        return used_codes.claim(code, user_id)
+    used = bank.setdefault("used_deposit_codes", [])
+    if code in used:
+        return False
+    used.append(code)
+    return True
+
+
+def _release_code(bank: dict, used_codes, code: str):
+    if used_codes is not None:
+        used_codes.release(code)
+    elif code in bank.get("used_deposit_codes", []):
+        bank["used_deposit_codes"].remove(code)
+
+
 def render_market(
     bank: dict,
     active_user: str,
     *,
     deposit_fn=None,
+    redeem_fn=None,
     save_fn=None,
+    used_codes=None,
+    transact_fn=None,
 ):
     """
     Premium Careon marketplace with glassmorphic design + purchase placeholders + deposit-code redemption.
@@ -84,196 +302,38 @@ def render_market(
 
     Optional (recommended):
       deposit_fn: function(bank, user_id, amount, description="") -> tx
-                 (use your main app deposit() to keep totals/txs consistent)
+                 (kept for existing callers; redemptions go through redeem_fn)
+      redeem_fn: function(bank, user_id, amount, description="") -> tx
+                 deposit-code redemption with the 95/5 fund split in one tx
+                 (use your main app redeem() so the tx reaches the bank store)
       save_fn: function() -> None
                a callback that persists bank to JSON (e.g., lambda: save_json(BANK_PATH, bank))
+      used_codes: object with is_used(code) / claim(code, user_id) -> bool / release(code)
+               (e.g., used_codes_store.UsedCodeStore). Without it, the legacy
+               bank["used_deposit_codes"] list is used.
+      transact_fn: function(fn) -> fn's result
+               runs fn(bank) as one locked read-modify-write on the freshest bank and
+               persists it (replaces save_fn)
 
     Behavior:
       - Market only renders if st.session_state["show_market"] is True
-      - Deposit codes credit global + personal (like a deposit)
-      - 🌍 SLD fund remains read-only / intentional-only (no auto addition)
+      - Deposit codes credit 95% to global + personal and 5% to the 🌍 SLD fund,
+        as one "redeem" tx (both legs land in the same write or neither does)
     """
 
     if not st.session_state.get("show_market", False):
         return
 
-    # CSS injection once
-    if not st.session_state.get("_careon_market_css", False):
-        st.markdown(
-            """
-            <style>
-            /* ========== MARKET CONTAINER ========== */
-            .market-palace {
-                background: linear-gradient(
-                    135deg,
-                    rgba(180, 130, 255, 0.08) 0%,
-                    rgba(120, 220, 210, 0.06) 100%
-                );
-                border: 1px solid rgba(255, 255, 255, 0.15);
-                border-radius: 24px;
-                padding: 1.8rem 2rem;
-                margin: 0.75rem 0 1.2rem 0;
-                backdrop-filter: blur(16px);
-                box-shadow:
-                    0 12px 48px rgba(0, 0, 0, 0.25),
-                    inset 0 1px 0 rgba(255, 255, 255, 0.10);
-                position: relative;
-                overflow: hidden;
-            }
-
-            /* Ambient light effect */
-            .market-palace::before {
-                content: '';
-                position: absolute;
-                top: -50%;
-                left: -50%;
-                width: 200%;
-                height: 200%;
-                background: radial-gradient(
-                    circle,
-                    rgba(246, 193, 119, 0.08) 0%,
-                    transparent 50%
-                );
-                animation: ambientRotate 20s linear infinite;
-                pointer-events: none;
-            }
-
-            @keyframes ambientRotate {
-                from { transform: rotate(0deg); }
-                to { transform: rotate(360deg); }
-            }
-
-            /* Title */
-            .market-title {
-                font-size: 1.65rem;
-                font-weight: 900;
-                letter-spacing: 0.15em;
-                text-align: center;
-                background: linear-gradient(
-                    135deg,
-                    #ffd27a 0%,
-                    #b482ff 50%,
-                    #78dcd2 100%
-                );
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                background-clip: text;
-                margin-bottom: 1.0rem;
-                filter: drop-shadow(0 2px 8px rgba(246,193,119,0.3));
-                position: relative;
-                z-index: 2;
-            }
-
-            /* Balance display */
-            .balance-shrine {
-                background: rgba(255, 255, 255, 0.06);
-                border: 1px solid rgba(246, 193, 119, 0.25);
-                border-radius: 18px;
-                padding: 1.05rem;
-                margin-bottom: 1.25rem;
-                text-align: center;
-                box-shadow:
-                    0 0 24px rgba(246, 193, 119, 0.15),
-                    inset 0 1px 0 rgba(255, 255, 255, 0.08);
-                position: relative;
-                z-index: 2;
-            }
-
-            .balance-label {
-                font-size: 0.85rem;
-                color: rgba(245, 245, 247, 0.75);
-                letter-spacing: 0.08em;
-                text-transform: uppercase;
-                margin-bottom: 0.35rem;
-            }
-
-            .balance-amount {
-                font-size: 2.15rem;
-                font-weight: 950;
-                color: #ffd27a;
-                letter-spacing: 0.08em;
-                text-shadow:
-                    0 0 24px rgba(246, 193, 119, 0.60),
-                    0 2px 4px rgba(0, 0, 0, 0.40);
-            }
-
-            /* Package cards */
-            .package-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(160px, 1fr));
-                gap: 1rem;
-                margin: 1.0rem 0 0.6rem 0;
-                position: relative;
-                z-index: 2;
-            }
-
-            .package-card {
-                background: rgba(255, 255, 255, 0.04);
-                border: 1px solid rgba(255, 255, 255, 0.12);
-                border-radius: 16px;
-                padding: 1.05rem 0.95rem;
-                text-align: center;
-                transition: all 0.25s ease;
-                cursor: default;
-            }
-
-            .package-card:hover {
-                background: rgba(255, 255, 255, 0.08);
-                border-color: rgba(246, 193, 119, 0.40);
-                transform: translateY(-3px);
-                box-shadow: 0 8px 24px rgba(246, 193, 119, 0.25);
-            }
-
-            .package-amount {
-                font-size: 1.55rem;
-                font-weight: 900;
-                color: #ffd27a;
-                margin-bottom: 0.2rem;
-            }
-
-            .package-price {
-                font-size: 0.85rem;
-                color: rgba(245, 245, 247, 0.72);
-            }
-
-            /* Divider */
-            .market-divider {
-                height: 1px;
-                background: linear-gradient(
-                    90deg,
-                    transparent,
-                    rgba(255, 255, 255, 0.15) 50%,
-                    transparent
-                );
-                margin: 1.25rem 0;
-                position: relative;
-                z-index: 2;
-            }
-
-            /* Info */
-            .market-info {
-                text-align: center;
-                font-size: 0.88rem;
-                color: rgba(245, 245, 247, 0.70);
-                line-height: 1.5;
-                margin-top: 0.9rem;
-                position: relative;
-                z-index: 2;
-            }
-            </style>
-            """,
-            unsafe_allow_html=True,
-        )
-        st.session_state["_careon_market_css"] = True
+    # CSS: once per session (the old _careon_market_css flag lost it on the next rerun)
+    style_registry.inject("careon_market")
 
     # Derived values
     global_balance = int(bank.get("balance", 0))
     network_fund = int(bank.get("sld_network_fund", 0))
     my_balance = _get_user_balance(bank, active_user)
-    used_codes = set(bank.get("used_deposit_codes", []))
 
-    # Pick deposit engine
-    do_deposit = deposit_fn if deposit_fn is not None else _fallback_deposit_like_main_app
+    # Pick redemption engine
+    do_redeem = redeem_fn if redeem_fn is not None else _fallback_redeem_like_main_app
 
     # ---------- UI ----------
     st.markdown('<div class="market-palace">', unsafe_allow_html=True)
@@ -359,7 +419,10 @@ def render_market(
     # DEPOSIT CODE REDEMPTION
     # ============================
     st.markdown("#### Redeem Deposit Code")
-    st.caption(f"Format: DEP-<amount>-<token> (example: DEP-50-AB12CD) • Credits add to **global + personal**.")
+    st.caption(
+        f"Format: DEP-<amount>-<token> (example: DEP-50-AB12CD) • {100 - bank_store.FUND_SHARE_PCT}% to "
+        f"**global + personal**, {bank_store.FUND_SHARE_PCT}% to the 🌍 SLD fund."
+    )
 
     col1, col2 = st.columns([3, 1])
     with col1:
@@ -390,35 +453,32 @@ def render_market(
                 st.error("Invalid amount.")
             elif amount > 5000:
                 st.error("That deposit amount is too large.")
-            elif norm_code in used_codes:
+            elif not _claim_code(bank, used_codes, norm_code, active_user):
                 st.error("That deposit code was already redeemed.")
             else:
-                # Credit as a deposit under your Branch B rules (global + personal)
+                # One "redeem" tx: 95% to the user, 5% to the fund, in a single write.
+                # (No separate bank["history"] entry: the tx is the record, and a doc
+                # change would cost the row/journal stores a full docs rewrite.)
+                def _credit(b: dict):
+                    do_redeem(b, active_user, amount, description=f"Deposit code redeemed: {norm_code}")
+
                 try:
-                    do_deposit(bank, active_user, amount, description=f"Deposit code redeemed: {norm_code}")
+                    if transact_fn is not None:
+                        transact_fn(_credit)
+                    else:
+                        _credit(bank)
+                        # Persist if a save function is provided
+                        if save_fn is not None:
+                            save_fn()
                 except Exception as e:
+                    _release_code(bank, used_codes, norm_code)
                     st.error(f"Could not apply deposit: {e}")
                 else:
-                    bank.setdefault("used_deposit_codes", [])
-                    bank["used_deposit_codes"].append(norm_code)
-
-                    hist = bank.setdefault("history", [])
-                    hist.append(
-                        {
-                            "ts": _now_iso(),
-                            "kind": "deposit_code",
-                            "code": norm_code,
-                            "amount": amount,
-                            "user_id": active_user,
-                            "note": "Credited to global + personal. No auto network fund.",
-                        }
+                    user_share, fund_share = bank_store.redemption_split(amount)
+                    st.success(
+                        f"Redeemed {amount} {C_LINE} → **{user_share}** to you + global, "
+                        f"**{fund_share}** to the 🌍 SLD Network Fund."
                     )
-
-                    # Persist if a save function is provided
-                    if save_fn is not None:
-                        save_fn()
-
-                    st.success(f"Redeemed {amount} {C_LINE} → credited to **you + global**.")
                     st.rerun()
 
     # Footer
@@ -426,7 +486,7 @@ def render_market(
         f"""
         <div class="market-info">
             🌍 SLD Network Fund: {network_fund} {C_LINE}<br/>
-            <em>Fund changes are intentional-only (no automatic cuts).</em>
+            <em>Every code redemption sends {bank_store.FUND_SHARE_PCT}% here.</em>
         </div>
         """,
         unsafe_allow_html=True,
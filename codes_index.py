@@ -0,0 +1,135 @@
+# codes_index.py
+import threading
+
+import json_cache
+
+
+# Process-wide index over codes_ledger.json:
+#   by_code: normalized code -> position in ledger["codes"]
+#   counts:  (package title, status) -> number of codes
+# Rebuilt lazily when the file's (mtime, size) stamp changes; our own saves
+# re-stamp it (note_saved) so a redemption doesn't force a rebuild.
+# set_status() runs on a transaction's private copy, so it only marks the row
+# as pending; note_saved() moves the counts once the commit has landed. A commit
+# that fails leaves the counts alone (its pending rows re-check at the next save).
+
+
+def normalize_code(code) -> str:
+    return " ".join(str(code or "").split()).upper()
+
+
+def package_key(row: dict) -> str:
+    pkg = row.get("package", {}) or {}
+    return str(pkg.get("title") or "Unpackaged")
+
+
+class CodeIndex:
+    def __init__(self):
+        self.stamp = False  # never equal to a real stamp (or to None = file missing)
+        self.by_code = {}
+        self.counts = {}
+        self.keys = []  # position -> (package title, status) as counted
+        self.pending = set()  # positions whose status changed in an uncommitted copy
+        self.n = 0
+
+    def rebuild(self, ledger: dict, stamp) -> None:
+        by_code, counts, keys = {}, {}, []
+        codes = ledger.get("codes", []) or []
+        for i, row in enumerate(codes):
+            by_code.setdefault(normalize_code(row.get("code")), i)
+            key = (package_key(row), row.get("status") or "new")
+            counts[key] = counts.get(key, 0) + 1
+            keys.append(key)
+        self.by_code, self.counts, self.keys, self.n, self.stamp = by_code, counts, keys, len(codes), stamp
+
+    def recount(self, ledger: dict) -> None:
+        # Move the counts of pending positions to what `ledger` (as committed) holds
+        codes = ledger.get("codes", []) or []
+        for pos in self.pending:
+            if pos >= len(codes) or pos >= len(self.keys):
+                continue
+            new = (package_key(codes[pos]), codes[pos].get("status") or "new")
+            old = self.keys[pos]
+            if new != old:
+                self.counts[old] = max(0, self.counts.get(old, 0) - 1)
+                self.counts[new] = self.counts.get(new, 0) + 1
+                self.keys[pos] = new
+        self.pending.clear()
+
+    def matches(self, ledger: dict) -> bool:
+        # Cheap guard that positions still line up with this ledger dict
+        codes = ledger.get("codes", []) or []
+        if len(codes) != self.n:
+            return False
+        if not codes:
+            return True
+        norm = normalize_code(codes[-1].get("code"))
+        pos = self.by_code.get(norm)
+        return pos is not None and normalize_code(codes[pos].get("code")) == norm
+
+
+_INDEXES = {}  # path -> CodeIndex
+_LOCK = threading.RLock()
+
+
+def get_index(ledger: dict, path: str | None = None) -> CodeIndex:
+    if not path:
+        idx = CodeIndex()
+        idx.rebuild(ledger, None)
+        return idx
+    with _LOCK:
+        idx = _INDEXES.get(path)
+        if idx is None:
+            idx = _INDEXES[path] = CodeIndex()
+        stamp = json_cache.file_stamp(path)
+        if idx.stamp != stamp or not idx.matches(ledger):
+            idx.rebuild(ledger, stamp)
+        return idx
+
+
+def find_code(ledger: dict, code: str, path: str | None = None):
+    norm = normalize_code(code)
+    if not norm:
+        return None
+    codes = ledger.get("codes", []) or []
+    with _LOCK:
+        idx = get_index(ledger, path)
+        pos = idx.by_code.get(norm)
+        if pos is None:
+            return None
+        row = codes[pos] if pos < len(codes) else None
+        if row is not None and normalize_code(row.get("code")) == norm:
+            return row
+        # Ledger dict was edited in place behind our back: rebuild once
+        idx.rebuild(ledger, json_cache.file_stamp(path))
+        pos = idx.by_code.get(norm)
+        return codes[pos] if pos is not None else None
+
+
+def set_status(ledger: dict, row: dict, status: str, path: str | None = None) -> None:
+    """Change a code's status; the counts follow at note_saved() once it is committed."""
+    with _LOCK:
+        idx = get_index(ledger, path)
+        row["status"] = status
+        pos = idx.by_code.get(normalize_code(row.get("code")))
+        if pos is not None:
+            idx.pending.add(pos)
+
+
+def count_by_package(ledger: dict, status: str = "new", path: str | None = None) -> dict:
+    """{package title: count} of codes in a given status, answered from the index."""
+    with _LOCK:
+        idx = get_index(ledger, path)
+        return {pkg: n for (pkg, st), n in sorted(idx.counts.items()) if st == status and n > 0}
+
+
+def note_saved(ledger: dict, path: str) -> None:
+    """Call after we commit the ledger ourselves: apply pending status changes and re-stamp."""
+    with _LOCK:
+        idx = _INDEXES.get(path)
+        if idx is not None and idx.matches(ledger):
+            idx.recount(ledger)
+            idx.stamp = json_cache.file_stamp(path)
+        else:
+            get_index(ledger, path)
+            _INDEXES[path].pending.clear()
@@ -0,0 +1,209 @@
+# codes_mint.py
+import json
+import os
+import secrets
+import time
+from datetime import datetime, timezone
+
+import file_txn
+import json_cache
+from codes_index import normalize_code
+
+
+# 32 symbols (no I/O/0/1) -> one random byte & 31 picks a symbol with no modulo bias
+ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+# Refuse waves that would fill more than this share of the code space (keeps codes unguessable
+# and collision retries rare)
+MAX_FILL = 0.01
+
+DEFAULT_TEMPLATES = {
+    "frontier_onboarding": {"code": "FRONTIER-XXXX", "status": "new", "package": {"title": "Frontier", "sign_on_bonus": 500}},
+    "admin_award": {"code": "ADMIN-XXXX", "status": "new", "package": {"title": "Admin Award", "admin_award_careon": 50}},
+}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _split_template(code_template: str) -> tuple[str, int]:
+    # "FRONTIER-XXXX" -> ("FRONTIER-", 4)
+    prefix = code_template.rstrip("X")
+    return prefix, len(code_template) - len(prefix)
+
+
+def _random_suffixes(length: int, batch: int):
+    raw = secrets.token_bytes(length * batch)
+    for i in range(0, len(raw), length):
+        yield "".join(ALPHABET[b & 31] for b in raw[i : i + length])
+
+
+def check_capacity(prefix: str, length: int, count: int, taken: set) -> None:
+    norm_prefix = normalize_code(prefix)
+    same_shape = sum(1 for c in taken if c.startswith(norm_prefix) and len(c) == len(norm_prefix) + length)
+    if count + same_shape > (len(ALPHABET) ** length) * MAX_FILL:
+        raise ValueError(
+            f"{count} codes at length {length} would fill too much of the code space; use a longer suffix."
+        )
+
+
+def generate_codes(prefix: str, length: int, count: int, taken: set):
+    """
+    Yields `count` new codes "<prefix><length random symbols>" not in `taken`
+    (normalized). New codes are added to `taken` as they are produced.
+    """
+    made = 0
+    while made < count:
+        for suffix in _random_suffixes(length, min(count - made, 65536)):
+            code = prefix + suffix
+            norm = normalize_code(code)
+            if norm in taken:
+                continue  # collision: just draw again
+            taken.add(norm)
+            made += 1
+            yield code
+            if made >= count:
+                break
+
+
+def _dump_indented(value, indent: str) -> str:
+    text = json.dumps(value, indent=2, ensure_ascii=False)
+    return text.replace("\n", "\n" + indent)
+
+
+def _mint_locked(path: str, count: int, template: str, length: int | None, package: dict | None) -> dict:
+    # Caller holds file_txn.file_lock(path); returns {bytes_written, generate_seconds, persist_seconds}
+    t0 = time.perf_counter()
+    with open(path, "r", encoding="utf-8") as f:
+        ledger = json.load(f)
+
+    templates = {**DEFAULT_TEMPLATES, **((ledger.get("meta", {}) or {}).get("templates", {}) or {})}
+    if template not in templates:
+        raise ValueError(f"Unknown template: {template}")
+    tpl = templates[template]
+
+    prefix, n_x = _split_template(tpl.get("code", "CODE-XXXX"))
+    if length is None:
+        length = n_x if count < 1000 else max(n_x, 8)
+    row_base = {k: v for k, v in tpl.items() if k != "code"}
+    row_base["status"] = "new"
+    if package is not None:
+        row_base["package"] = package
+
+    existing = ledger.pop("codes", []) or []
+    taken = {normalize_code(r.get("code")) for r in existing}
+    check_capacity(prefix, int(length), count, taken)
+    load_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new_codes = list(generate_codes(prefix, int(length), count, taken))
+    generate_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    meta = ledger.setdefault("meta", {})
+    meta["updated_at"] = _now_iso()
+    meta["rev"] = file_txn.get_rev(ledger) + 1
+
+    tmp = path + ".mint.tmp"
+    written = 0
+    first = True
+    out = open(tmp, "w", encoding="utf-8", newline="\n")
+    try:
+
+        def emit(s: str):
+            nonlocal written
+            out.write(s)
+            written += len(s.encode("utf-8"))
+
+        emit("{\n")
+        for k, v in ledger.items():
+            emit(f"  {json.dumps(k)}: {_dump_indented(v, '  ')},\n")
+        emit('  "codes": [\n')
+
+        for row in existing:
+            emit(("" if first else ",\n") + "    " + json.dumps(row, ensure_ascii=False))
+            first = False
+
+        for code in new_codes:
+            emit(("" if first else ",\n") + "    " + json.dumps({"code": code, **row_base}, ensure_ascii=False))
+            first = False
+
+        emit("\n  ]\n}\n")
+        out.flush()
+        os.fsync(out.fileno())
+        out.close()
+        os.replace(tmp, path)
+    except BaseException:
+        out.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return {
+        "bytes_written": written,
+        "generate_seconds": generate_seconds,
+        "persist_seconds": load_seconds + time.perf_counter() - t0,
+    }
+
+
+def mint_codes(
+    path: str,
+    count: int,
+    template: str = "frontier_onboarding",
+    *,
+    length: int | None = None,
+    package: dict | None = None,
+) -> dict:
+    """
+    Appends `count` fresh codes to the ledger at `path`. The ledger is parsed
+    (for the collision set and meta.rev), the new codes are generated, then the
+    whole ledger is rewritten row by row to a temp file that replaces it, so
+    persisting costs O(ledger size) on every wave.
+
+    template: key in ledger meta.templates (falls back to DEFAULT_TEMPLATES)
+    length:   random suffix length (default: the template's X count, min 8 for big waves)
+    package:  optional override of the template's package block
+
+    Returns a report: minted, seconds, codes_per_sec (generation only),
+    generate_seconds, persist_seconds (read + rewrite), bytes_written, path.
+    """
+    count = int(count)
+    if count <= 0:
+        raise ValueError("Count must be greater than 0.")
+
+    t0 = time.perf_counter()
+    # Same lock + meta.rev protocol as file_txn writers: a concurrent Join either
+    # commits before we read, or fails its rev check and retries on the new ledger
+    with file_txn.file_lock(path):
+        timing = _mint_locked(path, count, template, length, package)
+    json_cache.invalidate(path)
+
+    gen = timing["generate_seconds"]
+    return {
+        "minted": count,
+        "template": template,
+        "seconds": round(time.perf_counter() - t0, 3),
+        "codes_per_sec": int(count / gen) if gen > 0 else count,
+        "generate_seconds": round(gen, 3),
+        "persist_seconds": round(timing["persist_seconds"], 3),
+        "bytes_written": timing["bytes_written"],
+        "path": path,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mint a wave of access codes into codes_ledger.json.")
+    parser.add_argument("count", type=int)
+    parser.add_argument("--template", default="frontier_onboarding", help="frontier_onboarding | admin_award")
+    parser.add_argument("--length", type=int, default=None, help="random suffix length")
+    parser.add_argument("--path", default=os.path.join(os.path.dirname(__file__), "codes_ledger.json"))
+    args = parser.parse_args()
+
+    r = mint_codes(args.path, args.count, args.template, length=args.length)
+    print(
+        f"Minted {r['minted']} {r['template']} codes in {r['seconds']}s: generated in {r['generate_seconds']}s "
+        f"({r['codes_per_sec']} codes/s), persisted in {r['persist_seconds']}s "
+        f"({r['bytes_written']} bytes rewritten) -> {r['path']}"
+    )
@@ -0,0 +1,149 @@
+# deck_engine.py
+import hashlib
+import hmac
+import secrets
+import struct
+import time
+
+import economy_sim
+
+
+# Server-side deck for Classic / Rapid sessions, so the bank can check a
+# session's outcome and payout instead of trusting the browser's Math.random.
+#
+# Counter-based: the randomness for session (seed, counter) is
+#   SHAKE-256(b"sld-deck/v1" | seed | counter)
+# read as 3 little-endian u32 per draw (vibe, level roll, Zenith roll). There is
+# no generator state to keep: any session is one hash call, sessions of one seed
+# are independent of each other and of the order they are dealt in, and a
+# stored (seed, counter) regenerates the exact same draws for audit.
+#
+# Draws follow drawCardData()/checkZenith() in Estrella_table HTML (the client's
+# "force Zenith" checkbox has no server equivalent) and are packed one per byte:
+#   bits 0-1 vibe index (VIBES), bits 2-3 level (1-3), bit 4 Zenith.
+# A 20-draw session is therefore a 20-byte `bytes`.
+
+VERSION = b"sld-deck/v1"
+DRAWS = 20
+VIBES = economy_sim.VIBES
+_U32 = 1 << 32
+
+_ZENITH_BIT = 0x10
+
+
+def new_seed() -> str:
+    return secrets.token_hex(16)
+
+
+def _thresholds(zenith_pct: float) -> tuple:
+    # roll = u / 2**32 * 100; compare u * 100 against pct * 2**32 in integers
+    return (
+        economy_sim.LEVEL_2_ROLL * _U32,
+        economy_sim.LEVEL_3_ROLL * _U32,
+        int(float(zenith_pct) * _U32),
+    )
+
+
+def _stream(seed: str, counter: int, nbytes: int) -> bytes:
+    h = hashlib.shake_256(VERSION)
+    h.update(str(seed).encode("utf-8"))
+    h.update(b"\x00" + int(counter).to_bytes(8, "little"))
+    return h.digest(nbytes)
+
+
+def deal(seed: str, counter: int = 0, *, draws: int = DRAWS, zenith_pct: float = None) -> bytes:
+    """The packed draws of session (seed, counter), one byte per draw."""
+    if counter < 0:
+        raise ValueError("counter must be >= 0")
+    if zenith_pct is None:
+        zenith_pct = economy_sim.DEFAULTS["zenith_pct"]
+    lv2, lv3, zen = _thresholds(zenith_pct)
+    words = struct.unpack(f"<{3 * draws}I", _stream(seed, counter, 12 * draws))
+    out = bytearray(draws)
+    n_vibes = len(VIBES)
+    for i in range(draws):
+        v, lr, zr = words[3 * i], words[3 * i + 1], words[3 * i + 2]
+        lr *= 100
+        level = 3 if lr > lv3 else 2 if lr > lv2 else 1
+        out[i] = (v * n_vibes >> 32) | level << 2 | (_ZENITH_BIT if zr * 100 <= zen else 0)
+    return bytes(out)
+
+
+def deal_many(seed: str, start: int, count: int, **kwargs) -> list:
+    """Sessions start .. start+count-1 of one seed."""
+    return [deal(seed, c, **kwargs) for c in range(start, start + count)]
+
+
+def unpack(code: int) -> tuple:
+    """(vibe, level, is_zenith) for one packed draw."""
+    return VIBES[code & 0x3], (code >> 2) & 0x3, bool(code & _ZENITH_BIT)
+
+
+def zenith_count(packed: bytes) -> int:
+    return sum(1 for c in packed if c & _ZENITH_BIT)
+
+
+def settle_rapid(packed: bytes, cfg: dict | None = None) -> dict:
+    """Outcome and payout of a Rapid session (payouts from economy_sim config)."""
+    cfg = cfg or economy_sim.config()
+    zeniths = zenith_count(packed)
+    won = zeniths >= cfg["rapid_win_zeniths"]
+    return {
+        "zeniths": zeniths,
+        "won": won,
+        "payout": cfg["rapid_win_payout"] if won else cfg["rapid_loss_payout"],
+        "cost": cfg["rapid_cost"],
+    }
+
+
+def session_record(seed: str, counter: int, mode: str = "rapid", *, zenith_pct: float = None) -> dict:
+    """What the bank stores for a session: enough to re-deal and re-settle it."""
+    if mode not in ("rapid", "classic"):
+        raise ValueError(f"Unknown mode: {mode}")
+    packed = deal(seed, counter, zenith_pct=zenith_pct)
+    rec = {"v": VERSION.decode(), "mode": mode, "seed": seed, "counter": int(counter), "draws": packed.hex()}
+    if zenith_pct is not None:
+        rec["zenith_pct"] = zenith_pct
+    if mode == "rapid":
+        rec.update(settle_rapid(packed, economy_sim.config(zenith_pct=zenith_pct) if zenith_pct is not None else None))
+    else:
+        rec["zeniths"] = zenith_count(packed)
+    return rec
+
+
+def audit(record: dict) -> bool:
+    """True when the record's draws (and Rapid payout) match a fresh deal."""
+    if record.get("v") != VERSION.decode():
+        return False
+    try:
+        fresh = session_record(
+            record["seed"], record["counter"], record.get("mode", "rapid"), zenith_pct=record.get("zenith_pct")
+        )
+    except (KeyError, TypeError, ValueError):
+        return False
+    if not hmac.compare_digest(fresh["draws"], str(record.get("draws", ""))):
+        return False
+    return all(record.get(k) == fresh[k] for k in ("zeniths", "won", "payout") if k in fresh)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Deal, audit or benchmark server-side deck sessions.")
+    parser.add_argument("--seed", default=None)
+    parser.add_argument("--counter", type=int, default=0)
+    parser.add_argument("--bench", type=int, default=0, help="deal N sessions and report sessions/s")
+    args = parser.parse_args()
+
+    seed = args.seed or new_seed()
+    if args.bench:
+        t0 = time.perf_counter()
+        sessions = deal_many(seed, 0, args.bench)
+        seconds = time.perf_counter() - t0
+        wins = sum(1 for s in sessions if zenith_count(s) >= economy_sim.DEFAULTS["rapid_win_zeniths"])
+        print(f"{args.bench:,} sessions in {seconds:.3f}s ({int(args.bench / seconds):,}/s); Rapid win rate {wins / args.bench:.2%}")
+    else:
+        rec = session_record(seed, args.counter)
+        print(rec)
+        print(" ".join(f"{v[:3]}{lvl}{'*' if z else ''}" for v, lvl, z in map(unpack, bytes.fromhex(rec["draws"]))))
+        print("audit:", "ok" if audit(rec) else "MISMATCH")
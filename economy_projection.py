@@ -0,0 +1,271 @@
+# economy_projection.py
+import os
+import random
+import time
+from datetime import date
+
+try:
+    import numpy as np  # optional: vectorizes the per-user day loop
+except ImportError:  # pragma: no cover
+    np = None
+
+import bank_store
+import careon_bank
+import economy_sim
+
+
+# Population projection of the Careon economy, bootstrapped from the real ledger.
+#   python economy_projection.py --users 10000 --days 180 [--backend sqlite]
+#
+# Behavioral sample: every (user, calendar day) with txs in the bank's history
+# becomes one "active day" profile: earned (admin/other deposits), redeemed
+# (deposit codes), spent. The active rate is active days / days each user was
+# around (first tx .. end of the ledger). Each simulated day, every simulated
+# user is active with that rate and replays a random profile; spends only go
+# through if the balance covers them (as in spend()). Sign-on bonuses are left
+# out: the population is fixed and starts from real balances, so nobody joins.
+#
+# On top of the sample, active users play game rounds priced by the knobs in
+# careon_bank.py (ROUND_COST, AWARD_PER_EVENT per checkpoint, DAILY_BONUS), so
+# a knob change shows up in the forecast before it ships. Redemptions are split
+# per code with bank_store.redemption_split (the ledger's 95/5 rule), so the
+# projected sld_network_fund grows exactly as the ledger would. The global
+# "balance" follows the ledger rule in bank_store.tx_deltas (deposits and
+# spends both add to the pool).
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+BANK_PATH = os.path.join(APP_DIR, "careon_bank_v2.json")
+BANK_DB_PATH = os.path.join(APP_DIR, "careon_bank_v2.db")
+
+# users.md: VIP tiers by current balance
+TIERS = (("Stargazer", 0), ("Constellation", 100), ("Nebula", 500), ("Supernova", 1000))
+
+KNOBS = {
+    "daily_bonus": careon_bank.DAILY_BONUS,
+    "round_cost": careon_bank.ROUND_COST,
+    "award_per_event": careon_bank.AWARD_PER_EVENT,
+    "checkpoints": economy_sim.DEFAULTS["classic_checkpoints"],
+    "rounds_per_active_day": 1.0,
+}
+
+
+def tier_for(balance: int) -> str:
+    name = TIERS[0][0]
+    for tier, floor in TIERS:
+        if balance >= floor:
+            name = tier
+    return name
+
+
+def classify(tx: dict) -> str:
+    """'redeem', 'signon', 'earn', 'spend' or '' (not a balance change)."""
+    typ = tx.get("type")
+    desc = str(tx.get("description") or "")
+    if typ == "spend":
+        return "spend"
+    if typ not in ("deposit", "redeem"):
+        return ""
+    if desc.startswith("Sign-on bonus"):
+        return "signon"
+    if typ == "redeem" or desc.startswith("Deposit code redeemed"):
+        return "redeem"
+    return "earn"
+
+
+def _day(ts) -> str:
+    return str(ts or "")[:10]
+
+
+def behaviour_sample(txs) -> dict:
+    """
+    Folds a tx history (oldest first) into active-day profiles.
+    Returns: profiles [(earn, redeem, spend, fund)], active_rate, users, active_days.
+    fund is the sld_network_fund leg of that day's redemptions, split per code.
+    """
+    days = {}  # (user, day) -> [earn, redeem, spend, fund]
+    first_seen = {}
+    last_day = None
+    for tx in txs:
+        kind = classify(tx)
+        if not kind:
+            continue
+        uid = tx.get("user_id") or "user-1"
+        day = _day(tx.get("ts"))
+        if not day:
+            continue
+        first_seen.setdefault(uid, day)
+        last_day = max(last_day or day, day)
+        if kind == "signon":
+            continue
+        amt = abs(int(tx.get("amount", 0)))
+        row = days.setdefault((uid, day), [0, 0, 0, 0])
+        row[("earn", "redeem", "spend").index(kind)] += amt
+        if kind == "redeem":
+            row[3] += bank_store.redemption_split(amt)[1]
+
+    if not days:
+        raise ValueError("The bank history has no deposits or spends to sample from.")
+
+    end = date.fromisoformat(last_day)
+    lifetime = sum((end - date.fromisoformat(d)).days + 1 for d in first_seen.values())
+    return {
+        "profiles": [tuple(v) for v in days.values()],
+        "active_rate": min(1.0, len(days) / max(1, lifetime)),
+        "users": len(first_seen),
+        "active_days": len(days),
+    }
+
+
+def load_ledger(backend: str = bank_store.DEFAULT_BACKEND, json_path: str = BANK_PATH, db_path: str = BANK_DB_PATH):
+    """(bank, txs oldest-first) from whichever backend the app runs on."""
+    store = bank_store.open_bank_store(backend, json_path=json_path, db_path=db_path)
+    try:
+        bank = store.load({})
+        txs = list(store.history_source(bank)())
+    finally:
+        close = getattr(store, "close", None)
+        if close is not None:
+            close()
+    return bank, txs
+
+
+def _tier_shares(balances) -> dict:
+    counts = dict.fromkeys((t for t, _ in TIERS), 0)
+    for b in balances:
+        counts[tier_for(b)] += 1
+    n = max(1, len(balances))
+    return {t: round(c / n, 4) for t, c in counts.items()}
+
+
+def _rounds(rng, rate: float) -> int:
+    whole = int(rate)
+    return whole + (1 if rng.random() < rate - whole else 0)
+
+
+def project(
+    sample: dict,
+    *,
+    users: int,
+    days: int,
+    start_balances=None,
+    global_balance: int = 0,
+    fund: int = 0,
+    knobs: dict | None = None,
+    report_every: int = 30,
+    seed=None,
+) -> dict:
+    """
+    Simulates `days` days for `users` users. start_balances: real balances to
+    draw each user's opening balance from (default: everyone starts at 0).
+    Returns {"rows": [per report_every days], "seconds": ...}.
+    """
+    k = {**KNOBS, **(knobs or {})}
+    t0 = time.perf_counter()
+    profiles = sample["profiles"]
+    rate = sample["active_rate"]
+    award = k["checkpoints"] * k["award_per_event"]
+    cost = k["round_cost"]
+    starts = [int(b) for b in (start_balances or [])] or [0]
+    rows = []
+
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        prof = np.array(profiles, dtype=np.int64)
+        bal = rng.choice(np.array(starts, dtype=np.int64), size=users)
+        for day in range(1, days + 1):
+            active = rng.random(users) < rate
+            pick = prof[rng.integers(0, len(prof), size=users)] * active[:, None]
+            to_fund = pick[:, 3]
+            earn = pick[:, 0] + pick[:, 1] - to_fund + active * k["daily_bonus"]
+            bal += earn
+            spend = np.where(bal >= pick[:, 2], pick[:, 2], 0)
+            bal -= spend
+            whole = int(k["rounds_per_active_day"])
+            n_rounds = active * (whole + (rng.random(users) < k["rounds_per_active_day"] - whole))
+            if cost > 0:
+                n_rounds = np.minimum(n_rounds, bal // cost)
+            bal += n_rounds * (award - cost)
+            fund += int(to_fund.sum())
+            global_balance += int(earn.sum() + spend.sum() + (n_rounds * (award + cost)).sum())
+            if day % report_every == 0 or day == days:
+                rows.append(_row(day, bal.tolist(), global_balance, fund))
+    else:
+        rng = random.Random(seed)
+        bal = [rng.choice(starts) for _ in range(users)]
+        for day in range(1, days + 1):
+            for i in range(users):
+                if rng.random() >= rate:
+                    continue
+                e, redeem, s, to_fund = rng.choice(profiles)
+                earn = e + redeem - to_fund + k["daily_bonus"]
+                b = bal[i] + earn
+                if b < s:
+                    s = 0
+                b -= s
+                n_rounds = _rounds(rng, k["rounds_per_active_day"])
+                if cost > 0:
+                    n_rounds = min(n_rounds, b // cost)
+                bal[i] = b + n_rounds * (award - cost)
+                fund += to_fund
+                global_balance += earn + s + n_rounds * (award + cost)
+            if day % report_every == 0 or day == days:
+                rows.append(_row(day, bal, global_balance, fund))
+
+    return {"rows": rows, "seconds": round(time.perf_counter() - t0, 3)}
+
+
+def _row(day: int, balances: list, global_balance: int, fund: int) -> dict:
+    supply = sum(balances)
+    return {
+        "day": day,
+        "user_supply": int(supply),
+        "mean_balance": round(supply / max(1, len(balances)), 1),
+        "global_balance": int(global_balance),
+        "sld_network_fund": int(fund),
+        "tiers": _tier_shares(balances),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Project balances, fund and VIP tiers from the bank's tx history.")
+    parser.add_argument("--backend", default=bank_store.DEFAULT_BACKEND, choices=["json", "sqlite", "journal"])
+    parser.add_argument("--json-path", default=BANK_PATH)
+    parser.add_argument("--db-path", default=BANK_DB_PATH)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--report-every", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=None)
+    for key, value in KNOBS.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args()
+
+    bank, txs = load_ledger(args.backend, args.json_path, args.db_path)
+    sample = behaviour_sample(txs)
+    r = project(
+        sample,
+        users=args.users,
+        days=args.days,
+        start_balances=list((bank.get("balances_by_user") or {}).values()),
+        global_balance=int(bank.get("balance", 0) or 0),
+        fund=int(bank.get("sld_network_fund", 0) or 0),
+        knobs={k: getattr(args, k) for k in KNOBS},
+        report_every=args.report_every,
+        seed=args.seed,
+    )
+
+    engine = "numpy" if np is not None else "python"
+    print(
+        f"Sample: {len(txs):,} txs, {sample['users']} users, {sample['active_days']} active days "
+        f"(active rate {sample['active_rate']:.1%}); projected {args.users:,} users x {args.days} days "
+        f"[{engine}] in {r['seconds']}s"
+    )
+    names = [t for t, _ in TIERS]
+    header = f"{'day':>5} {'supply':>12} {'mean':>9} {'global':>12} {'fund':>9}  "
+    print(header + " ".join(f"{n[:6]:>7}" for n in names))
+    for row in r["rows"]:
+        print(
+            f"{row['day']:>5} {row['user_supply']:>12,} {row['mean_balance']:>9} {row['global_balance']:>12,} "
+            f"{row['sld_network_fund']:>9,}  " + " ".join(f"{row['tiers'][n]:>7.1%}" for n in names)
+        )
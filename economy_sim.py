@@ -0,0 +1,159 @@
+# economy_sim.py
+import math
+import random
+import time
+from collections import Counter
+
+try:
+    import numpy as np  # optional: faster batches; pure Python works without it
+except ImportError:  # pragma: no cover
+    np = None
+
+
+# Monte Carlo for the Classic / Rapid draw economy (rules from Estrella_table HTML,
+# costs from currency.md):
+#   drawCardData(): vibe = 1 of 3 (uniform); level roll in [0, 100): > 75 -> 2, > 95 -> 3
+#   checkZenith():  roll * 100 <= 5  -> 5% per draw, independent of vibe/level
+#   Rapid:   20 draws, win on 2+ Zeniths; costs 5, pays 23 on a win (20 + 3 completion), 1 on a loss
+#   Classic: 20 draws, costs 1 (ROUND_COST), pays 3 checkpoints x 1 (AWARD_PER_EVENT)
+# Only the Zenith count decides a payout, and the count of 20 independent 5% draws
+# is Binomial(20, 0.05), so a batch samples counts directly (numpy.binomial, or
+# random.choices over the exact binomial CDF) instead of 20 uniforms per session.
+# Net figures are from the player's side: a positive mean is what every play
+# drains from the bank.
+
+VIBES = ("acuity", "valor", "variety")
+LEVEL_2_ROLL = 75
+LEVEL_3_ROLL = 95
+
+DEFAULTS = {
+    "draws": 20,
+    "zenith_pct": 5.0,
+    "rapid_cost": 5,
+    "rapid_win_zeniths": 2,
+    "rapid_win_payout": 23,
+    "rapid_loss_payout": 1,
+    "classic_cost": 1,  # careon_bank.ROUND_COST
+    "classic_checkpoints": 3,
+    "classic_award_per_event": 1,  # careon_bank.AWARD_PER_EVENT
+}
+
+BATCH = 1_000_000
+
+
+def config(**overrides) -> dict:
+    unknown = set(overrides) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown economy settings: {', '.join(sorted(unknown))}")
+    return {**DEFAULTS, **overrides}
+
+
+def binomial_pmf(n: int, p: float) -> list:
+    return [math.comb(n, k) * p**k * (1 - p) ** (n - k) for k in range(n + 1)]
+
+
+def zenith_histogram(sessions: int, draws: int, zenith_pct: float, seed=None) -> list:
+    """hist[k] = number of sessions (of `sessions`) that drew exactly k Zeniths."""
+    p = float(zenith_pct) / 100.0
+    hist = [0] * (draws + 1)
+    left = int(sessions)
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        while left > 0:
+            n = min(left, BATCH)
+            counts = np.bincount(rng.binomial(draws, p, size=n), minlength=draws + 1)
+            for k, c in enumerate(counts.tolist()):
+                hist[k] += c
+            left -= n
+        return hist
+
+    rng = random.Random(seed)
+    cum, acc = [], 0.0
+    for q in binomial_pmf(draws, p):
+        acc += q
+        cum.append(acc)
+    ks = range(draws + 1)
+    while left > 0:
+        n = min(left, BATCH)
+        for k, c in Counter(rng.choices(ks, cum_weights=cum, k=n)).items():
+            hist[k] += c
+        left -= n
+    return hist
+
+
+def _report(mode: str, nets: dict, seconds: float, exact: dict) -> dict:
+    # nets: net per play -> number of sessions
+    n = sum(nets.values())
+    mean = sum(v * c for v, c in nets.items()) / n
+    var = sum(c * (v - mean) ** 2 for v, c in nets.items()) / max(1, n - 1)
+    return {
+        "mode": mode,
+        "sessions": n,
+        "mean_net": round(mean, 4),
+        "variance": round(var, 4),
+        "stdev": round(math.sqrt(var), 4),
+        "stderr": round(math.sqrt(var / n), 5),
+        "drain_per_1k_plays": round(mean * 1000, 1),
+        "exact_mean_net": round(exact["mean"], 4),
+        "exact_variance": round(exact["variance"], 4),
+        "seconds": round(seconds, 3),
+        "sessions_per_sec": int(n / seconds) if seconds > 0 else None,
+    }
+
+
+def rapid_net(k: int, cfg: dict) -> int:
+    won = k >= cfg["rapid_win_zeniths"]
+    return (cfg["rapid_win_payout"] if won else cfg["rapid_loss_payout"]) - cfg["rapid_cost"]
+
+
+def exact_rapid(cfg: dict) -> dict:
+    pmf = binomial_pmf(cfg["draws"], cfg["zenith_pct"] / 100.0)
+    mean = sum(q * rapid_net(k, cfg) for k, q in enumerate(pmf))
+    var = sum(q * (rapid_net(k, cfg) - mean) ** 2 for k, q in enumerate(pmf))
+    p_win = sum(pmf[cfg["rapid_win_zeniths"] :])
+    return {"mean": mean, "variance": var, "p_win": p_win}
+
+
+def simulate_rapid(sessions: int, cfg: dict | None = None, seed=None) -> dict:
+    cfg = cfg or config()
+    t0 = time.perf_counter()
+    hist = zenith_histogram(sessions, cfg["draws"], cfg["zenith_pct"], seed)
+    nets = Counter()
+    for k, c in enumerate(hist):
+        if c:
+            nets[rapid_net(k, cfg)] += c
+    exact = exact_rapid(cfg)
+    report = _report("rapid", nets, time.perf_counter() - t0, exact)
+    wins = sum(hist[cfg["rapid_win_zeniths"] :])
+    report["win_rate"] = round(wins / max(1, sessions), 5)
+    report["exact_win_rate"] = round(exact["p_win"], 5)
+    return report
+
+
+def simulate_classic(sessions: int, cfg: dict | None = None, seed=None) -> dict:
+    """Classic pays every checkpoint regardless of the draws: the net is fixed."""
+    cfg = cfg or config()
+    net = cfg["classic_checkpoints"] * cfg["classic_award_per_event"] - cfg["classic_cost"]
+    return _report("classic", {net: int(sessions)}, 0.0, {"mean": net, "variance": 0.0})
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Monte Carlo of Rapid / Classic economics (player net per play).")
+    parser.add_argument("--sessions", type=int, default=5_000_000)
+    parser.add_argument("--seed", type=int, default=None)
+    for key, value in DEFAULTS.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args()
+
+    cfg = config(**{k: getattr(args, k) for k in DEFAULTS})
+    engine = "numpy" if np is not None else "python"
+    for r in (simulate_rapid(args.sessions, cfg, args.seed), simulate_classic(args.sessions, cfg)):
+        extra = f"  win rate {r['win_rate']:.2%} (exact {r['exact_win_rate']:.2%})" if "win_rate" in r else ""
+        speed = f"in {r['seconds']}s ({r['sessions_per_sec']:,}/s)" if r["sessions_per_sec"] else "(closed form)"
+        print(
+            f"{r['mode']:<8} {r['sessions']:,} sessions [{engine}] {speed}: net/play {r['mean_net']:+.4f} ± {r['stderr']:.4f} "
+            f"(exact {r['exact_mean_net']:+.4f}), variance {r['variance']}, "
+            f"drain/1k plays {r['drain_per_1k_plays']:+}{extra}"
+        )
@@ -0,0 +1,161 @@
+# economy_sweep.py
+import itertools
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import economy_sim
+
+
+# Parameter sweep over economy_sim for balancing Careon payouts.
+#   python economy_sweep.py --band -0.5 0.5 [--random 5000] [--workers N]
+# Builds a grid (every combination of the value lists) or, with --random N, N
+# configurations drawn uniformly between each list's min and max. Configurations
+# are simulated in chunks across a process pool; the ones whose net per play
+# falls inside the target band are ranked by distance to the band's midpoint.
+# Rapid is simulated (with its closed form alongside); Classic is closed form.
+# The Rapid win threshold (Zeniths needed to win) is swept with the Zenith rate:
+# together they set the win probability the payout has to balance.
+
+SWEEP_KEYS = (
+    "rapid_cost",
+    "rapid_win_payout",
+    "rapid_win_zeniths",
+    "zenith_pct",
+    "classic_cost",
+    "classic_award_per_event",
+)
+
+DEFAULT_GRID = {
+    "rapid_cost": [3, 4, 5, 6, 7, 8],
+    "rapid_win_payout": list(range(10, 31)),
+    "rapid_win_zeniths": [1, 2, 3],
+    "zenith_pct": [3.0, 4.0, 5.0, 6.0, 7.0],
+    "classic_cost": [1, 2, 3],
+    "classic_award_per_event": [0, 1, 2],
+}
+
+CHUNK = 64  # configurations per pool task
+
+
+def grid(values: dict) -> list:
+    keys = [k for k in SWEEP_KEYS if k in values]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(values[k] for k in keys))]
+
+
+def random_points(values: dict, n: int, seed=None) -> list:
+    """n configurations drawn uniformly between each list's min and max."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        point = {}
+        for k in SWEEP_KEYS:
+            if k not in values:
+                continue
+            lo, hi = min(values[k]), max(values[k])
+            if isinstance(economy_sim.DEFAULTS[k], int):
+                point[k] = rng.randint(int(lo), int(hi))
+            else:
+                point[k] = round(rng.uniform(lo, hi), 2)
+        out.append(point)
+    return out
+
+
+def _evaluate(points: list, sessions: int, base: dict, seed) -> list:
+    """Worker (runs in the pool): one row per configuration."""
+    rows = []
+    for i, point in enumerate(points):
+        cfg = economy_sim.config(**{**base, **point})
+        rapid = economy_sim.simulate_rapid(sessions, cfg, None if seed is None else seed + i)
+        classic = economy_sim.simulate_classic(sessions, cfg)
+        rows.append(
+            {
+                **point,
+                "rapid_net": rapid["mean_net"],
+                "rapid_exact": rapid["exact_mean_net"],
+                "rapid_stderr": rapid["stderr"],
+                "rapid_win_rate": rapid["win_rate"],
+                "rapid_stdev": rapid["stdev"],
+                "classic_net": classic["mean_net"],
+            }
+        )
+    return rows
+
+
+def _in_band(row: dict, band: tuple, mode: str) -> bool:
+    lo, hi = band
+    nets = [row["rapid_net"], row["classic_net"]] if mode == "both" else [row[f"{mode}_net"]]
+    return all(lo <= v <= hi for v in nets)
+
+
+def _distance(row: dict, band: tuple, mode: str) -> float:
+    mid = (band[0] + band[1]) / 2
+    nets = [row["rapid_net"], row["classic_net"]] if mode == "both" else [row[f"{mode}_net"]]
+    return max(abs(v - mid) for v in nets)
+
+
+def sweep(
+    points: list,
+    band: tuple,
+    *,
+    mode: str = "rapid",
+    sessions: int = 100_000,
+    base: dict | None = None,
+    workers: int | None = None,
+    seed=None,
+) -> dict:
+    """
+    Simulates every configuration in `points` and ranks the ones in `band`.
+    mode: which net per play must be in the band: "rapid", "classic" or "both".
+    Returns a report: ranked (rows, best first), evaluated, seconds.
+    """
+    if mode not in ("rapid", "classic", "both"):
+        raise ValueError(f"Unknown sweep mode: {mode}")
+    base = dict(base or {})
+    t0 = time.perf_counter()
+    chunks = [points[i : i + CHUNK] for i in range(0, len(points), CHUNK)]
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_evaluate, chunk, sessions, base, None if seed is None else seed + i * CHUNK)
+            for i, chunk in enumerate(chunks)
+        ]
+        for fut in futures:
+            rows.extend(fut.result())
+
+    ranked = [r for r in rows if _in_band(r, band, mode)]
+    ranked.sort(key=lambda r: (_distance(r, band, mode), r.get("rapid_stdev", 0.0)))
+    return {"ranked": ranked, "evaluated": len(rows), "seconds": round(time.perf_counter() - t0, 3)}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sweep Careon cost/payout settings for a target net per play.")
+    parser.add_argument("--band", type=float, nargs=2, default=[-0.5, 0.5], metavar=("LO", "HI"))
+    parser.add_argument("--mode", choices=["rapid", "classic", "both"], default="rapid")
+    parser.add_argument("--sessions", type=int, default=100_000, help="simulated Rapid sessions per configuration")
+    parser.add_argument("--random", type=int, default=0, help="sample N configurations instead of the full grid")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--top", type=int, default=20)
+    for key, values in DEFAULT_GRID.items():
+        kind = type(economy_sim.DEFAULTS[key])
+        parser.add_argument(f"--{key.replace('_', '-')}", type=kind, nargs="+", default=values)
+    args = parser.parse_args()
+
+    values = {k: getattr(args, k) for k in DEFAULT_GRID}
+    points = random_points(values, args.random, args.seed) if args.random else grid(values)
+    r = sweep(points, tuple(args.band), mode=args.mode, sessions=args.sessions, workers=args.workers, seed=args.seed)
+
+    print(
+        f"{r['evaluated']:,} configurations x {args.sessions:,} sessions in {r['seconds']}s; "
+        f"{len(r['ranked'])} with {args.mode} net/play in [{args.band[0]}, {args.band[1]}]"
+    )
+    print(f"{'cost':>5} {'payout':>6} {'win@':>4} {'zen%':>5} {'c.cost':>6} {'award':>5} {'rapid':>8} {'exact':>8} {'±':>6} {'win%':>6} {'classic':>7}")
+    for row in r["ranked"][: args.top]:
+        print(
+            f"{row['rapid_cost']:>5} {row['rapid_win_payout']:>6} {row['rapid_win_zeniths']:>4} {row['zenith_pct']:>5} "
+            f"{row['classic_cost']:>6} {row['classic_award_per_event']:>5} {row['rapid_net']:>+8.3f} {row['rapid_exact']:>+8.3f} "
+            f"{row['rapid_stderr']:>6.3f} {row['rapid_win_rate']:>6.1%} {row['classic_net']:>+7.1f}"
+        )
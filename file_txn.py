@@ -0,0 +1,340 @@
+# file_txn.py
+import copy
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+
+import json_cache
+
+try:
+    import fcntl  # POSIX only; on other platforms locks are in-process only
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+# Concurrency layer for the JSON files:
+# - file_lock(path): exclusive lock shared by threads (RLock) and processes (flock on
+#   "<path>.lock"); re-entrant for the thread that holds it
+# - meta["rev"]: version counter bumped on every write
+# - cas_write_json(): compare-and-swap write (fails with ConflictError if the file's rev
+#   moved since we loaded it)
+# - transact_json(): read-modify-write under the lock, retried on conflict
+# - transact_files(): the same across several files, committed all-or-nothing
+# Loaders usually hand back the shared json_cache object; both transact_*()
+# functions run fn on a private deep copy of it, so a half-applied fn (or one
+# that is retried) is never visible to other sessions or written by them.
+
+DEFAULT_RETRIES = 5
+
+
+class ConflictError(RuntimeError):
+    """The file changed under us (someone else wrote a newer rev)."""
+
+
+class _LockEntry:
+    def __init__(self):
+        self.rlock = threading.RLock()
+        self.depth = 0
+        self.fh = None
+
+
+_LOCKS = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _entry(path: str) -> _LockEntry:
+    key = os.path.abspath(path)
+    with _LOCKS_GUARD:
+        e = _LOCKS.get(key)
+        if e is None:
+            e = _LOCKS[key] = _LockEntry()
+        return e
+
+
+@contextmanager
+def file_lock(path: str):
+    e = _entry(path)
+    with e.rlock:
+        e.depth += 1
+        try:
+            if e.depth == 1 and fcntl is not None:
+                d = os.path.dirname(path)
+                if d:
+                    os.makedirs(d, exist_ok=True)
+                e.fh = open(path + ".lock", "a+")
+                fcntl.flock(e.fh.fileno(), fcntl.LOCK_EX)
+            yield
+        finally:
+            e.depth -= 1
+            if e.depth == 0 and e.fh is not None:
+                try:
+                    fcntl.flock(e.fh.fileno(), fcntl.LOCK_UN)
+                finally:
+                    e.fh.close()
+                    e.fh = None
+
+
+def get_rev(data) -> int:
+    if not isinstance(data, dict):
+        return 0
+    return int((data.get("meta") or {}).get("rev", 0) or 0)
+
+
+def _read_rev(path: str) -> int:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return get_rev(json.load(f))
+    except FileNotFoundError:
+        return 0
+    except Exception:
+        return -1  # unreadable: never matches, forces a reload
+
+
+def cas_write_json(path: str, data: dict, expected_rev: int, stamp, write_fn) -> None:
+    """
+    Write `data` only if the file is still at `expected_rev`.
+    stamp: json_cache.file_stamp(path) taken when `data` was loaded (fast path:
+    unchanged stamp means nobody wrote since, so no re-parse is needed).
+    write_fn(path, data) does the actual write.
+    """
+    with file_lock(path):
+        current = json_cache.file_stamp(path)
+        if current != stamp and _read_rev(path) != expected_rev:
+            raise ConflictError(f"{os.path.basename(path)} changed (expected rev {expected_rev}).")
+        data.setdefault("meta", {})["rev"] = expected_rev + 1
+        try:
+            write_fn(path, data)
+        except Exception:
+            data["meta"]["rev"] = expected_rev
+            json_cache.invalidate(path)
+            raise
+
+
+def transact_json(path: str, load_fn, fn, write_fn, retries: int = DEFAULT_RETRIES):
+    """
+    Read-modify-write transaction on one JSON file:
+      data = load_fn(); result = fn(data); write data (rev + 1)
+    Runs under file_lock(path) on a private copy of the loaded data; on
+    ConflictError (a writer that doesn't take the lock got in between) the cached
+    copy is dropped and the whole thing retried. If fn raises, nothing is
+    written. Returns (result, data).
+    """
+    last = None
+    for attempt in range(max(1, int(retries))):
+        with file_lock(path):
+            stamp = json_cache.file_stamp(path)
+            data = copy.deepcopy(load_fn())
+            rev = get_rev(data)
+            result = fn(data)
+            try:
+                cas_write_json(path, data, rev, stamp, write_fn)
+                return result, data
+            except ConflictError as e:
+                last = e
+                json_cache.invalidate(path)
+        time.sleep(0.01 * (2 ** attempt))
+    raise last or ConflictError(f"{os.path.basename(path)}: too many conflicts")
+
+
+# ============================================================
+# Multi-file commit (write-ahead intent + atomic renames)
+# ============================================================
+# commit_files() makes several JSON files change together:
+#   1. each new version is written + fsynced to "<path>.txn-<id>.tmp" (no lock held)
+#   2. under the locks of all paths (sorted order): CAS check, then the intent record
+#      ".txn-<id>.intent.json" listing (tmp, path, new rev) renames is written
+#      atomically; this is the commit point
+#   3. renames are applied and the intent removed
+# recover() rolls forward any intent left by a crash between 2 and 3, then removes
+# stale tmp files of transactions that never reached their commit point.
+
+INTENT_PREFIX = ".txn-"
+INTENT_SUFFIX = ".intent.json"
+STALE_TMP_SECONDS = 300
+
+
+def _fsync_dir(d: str) -> None:
+    try:
+        fd = os.open(d or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_durable(path: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _roll_forward(intent_path: str) -> None:
+    """
+    Apply an intent's renames, then drop it. A tmp that is gone is fine only if
+    its file already carries the committed rev (an earlier roll-forward got that
+    far); otherwise raise FileNotFoundError and keep the intent for recover().
+    """
+    with open(intent_path, "r", encoding="utf-8") as f:
+        intent = json.load(f)
+    for tmp, path, *rev in intent.get("renames", []):
+        if os.path.exists(tmp):
+            os.replace(tmp, path)
+        elif rev and _read_rev(path) < rev[0]:
+            raise FileNotFoundError(f"{os.path.basename(tmp)} is missing; {os.path.basename(path)} not applied.")
+        json_cache.invalidate(path)
+    os.remove(intent_path)
+    _fsync_dir(os.path.dirname(intent_path))
+
+
+@contextmanager
+def _lock_all(paths):
+    with ExitStack() as stack:
+        for p in sorted(set(os.path.abspath(p) for p in paths)):
+            stack.enter_context(file_lock(p))
+        yield
+
+
+def commit_files(docs: dict, stamps: dict, revs: dict, txn_dir: str | None = None) -> None:
+    """
+    Atomically replace several JSON files.
+    docs:   {path: data}
+    stamps: {path: json_cache.file_stamp(path) taken when data was loaded}
+    revs:   {path: meta.rev of data when it was loaded}
+    Raises ConflictError (nothing written) if any file moved past its rev.
+    """
+    txn_id = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+    txn_dir = txn_dir or os.path.dirname(os.path.abspath(next(iter(docs))))
+    intent_path = os.path.join(txn_dir, f"{INTENT_PREFIX}{txn_id}{INTENT_SUFFIX}")
+
+    renames = []
+    try:
+        for path, data in docs.items():
+            data.setdefault("meta", {})["rev"] = revs[path] + 1
+            tmp = f"{path}.txn-{txn_id}.tmp"
+            renames.append((tmp, path, revs[path] + 1))
+            _write_durable(tmp, json.dumps(data, indent=2, ensure_ascii=False))
+
+        with _lock_all(docs):
+            for path in docs:
+                if json_cache.file_stamp(path) != stamps.get(path) and _read_rev(path) != revs[path]:
+                    raise ConflictError(f"{os.path.basename(path)} changed (expected rev {revs[path]}).")
+
+            _write_durable(intent_path + ".tmp", json.dumps({"id": txn_id, "renames": renames}))
+            os.replace(intent_path + ".tmp", intent_path)
+            _fsync_dir(txn_dir)
+
+            # Committed: from here on a crash is finished by recover()
+            for tmp, path, _ in renames:
+                os.replace(tmp, path)
+            for path, data in docs.items():
+                json_cache.put(path, data)
+            os.remove(intent_path)
+            _fsync_dir(txn_dir)
+    except BaseException:
+        if os.path.exists(intent_path):
+            # Past the commit point: finish it rather than report a failure
+            # (if this raises too, the intent stays on disk for recover())
+            with _lock_all(docs):
+                _roll_forward(intent_path)
+            return
+        for path, data in docs.items():
+            data["meta"]["rev"] = revs[path]
+            json_cache.invalidate(path)
+        for tmp, _, _ in renames:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        raise
+
+
+def transact_files(loaders: dict, fn, txn_dir: str | None = None, retries: int = DEFAULT_RETRIES):
+    """
+    Read-modify-write across several JSON files as one commit unit:
+      docs = {path: load()}; result = fn(docs); commit_files(docs)
+    fn gets private copies of the loaded docs. No lock is held while loading,
+    in fn or while serializing; only the CAS check and renames run under the
+    file locks. On conflict everything is reloaded and fn runs again, so fn
+    must re-validate against `docs`. Returns (result, docs).
+    """
+    last = None
+    for attempt in range(max(1, int(retries))):
+        stamps = {p: json_cache.file_stamp(p) for p in loaders}
+        docs = {p: copy.deepcopy(load()) for p, load in loaders.items()}
+        revs = {p: get_rev(d) for p, d in docs.items()}
+        result = fn(docs)
+        try:
+            commit_files(docs, stamps, revs, txn_dir)
+            return result, docs
+        except ConflictError as e:
+            last = e
+        time.sleep(0.01 * (2 ** attempt))
+    raise last or ConflictError("too many conflicts")
+
+
+def _txn_id(name: str) -> str:
+    # ".txn-<id>.intent.json" or "<file>.txn-<id>.tmp" -> "<id>"
+    if name.startswith(INTENT_PREFIX) and name.endswith(INTENT_SUFFIX):
+        return name[len(INTENT_PREFIX) : -len(INTENT_SUFFIX)]
+    return name.rsplit(".txn-", 1)[-1][: -len(".tmp")]
+
+
+def recover(txn_dir: str) -> int:
+    """
+    Finish committed-but-unapplied transactions in txn_dir; returns how many.
+    Every intent is rolled forward first; only then are stale tmps swept, and
+    never one that an intent still on disk (a failed roll-forward) names.
+    """
+    done = 0
+    try:
+        names = sorted(os.listdir(txn_dir))
+    except OSError:
+        return 0
+    for name in names:
+        full = os.path.join(txn_dir, name)
+        if not (name.startswith(INTENT_PREFIX) and name.endswith(INTENT_SUFFIX)):
+            continue
+        try:
+            with open(full, "r", encoding="utf-8") as f:
+                paths = [r[1] for r in json.load(f).get("renames", [])]
+            with _lock_all(paths):
+                if os.path.exists(full):  # the writer may have finished meanwhile
+                    _roll_forward(full)
+                    done += 1
+        except (OSError, ValueError):
+            continue
+
+    try:
+        names = os.listdir(txn_dir)
+    except OSError:
+        return done
+    pending = {_txn_id(n) for n in names if n.startswith(INTENT_PREFIX) and n.endswith(INTENT_SUFFIX)}
+    for name in names:
+        if ".txn-" not in name or not name.endswith(".tmp") or _txn_id(name) in pending:
+            continue
+        full = os.path.join(txn_dir, name)
+        try:
+            if time.time() - os.path.getmtime(full) > STALE_TMP_SECONDS:
+                os.remove(full)
+        except OSError:
+            pass
+    return done
+
+
+_RECOVERED = set()
+
+
+def recover_once(txn_dir: str) -> int:
+    """recover() the first time a process asks for txn_dir (startup), no-op after."""
+    key = os.path.abspath(txn_dir)
+    with _LOCKS_GUARD:
+        if key in _RECOVERED:
+            return 0
+        _RECOVERED.add(key)
+    return recover(txn_dir)
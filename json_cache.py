@@ -0,0 +1,76 @@
+# json_cache.py
+import os
+import threading
+import time
+
+
+# Process-wide cache of parsed JSON files, shared by every session and rerun.
+# Entries are keyed on (mtime_ns, size) of the file; save_json() writes through
+# with put() so our own writes never cost a re-parse.
+#
+# NOTE: callers get the SAME object back (no copy; copying would cost about as
+# much as parsing). Anything that mutates a loaded dict must either save it
+# (put) or invalidate() the path if the save fails.
+
+MISS = object()
+
+_LOCK = threading.Lock()
+_ENTRIES = {}  # path -> (stamp, data)
+_STATS = {"hits": 0, "misses": 0, "writes": 0, "invalidations": 0, "since": time.time()}
+
+
+def file_stamp(path: str | None):
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def get(path: str):
+    """Parsed data for path if the file hasn't changed since it was cached, else MISS."""
+    stamp = file_stamp(path)
+    with _LOCK:
+        entry = _ENTRIES.get(path)
+        if entry is not None and stamp is not None and entry[0] == stamp:
+            _STATS["hits"] += 1
+            return entry[1]
+        _STATS["misses"] += 1
+        return MISS
+
+
+def put(path: str, data) -> None:
+    stamp = file_stamp(path)
+    with _LOCK:
+        if stamp is None:
+            _ENTRIES.pop(path, None)
+        else:
+            _ENTRIES[path] = (stamp, data)
+        _STATS["writes"] += 1
+
+
+def invalidate(path: str) -> None:
+    with _LOCK:
+        _ENTRIES.pop(path, None)
+        _STATS["invalidations"] += 1
+
+
+def stats() -> dict:
+    with _LOCK:
+        s = dict(_STATS)
+        s["entries"] = len(_ENTRIES)
+    minutes = max((time.time() - s.pop("since")) / 60.0, 1e-9)
+    lookups = s["hits"] + s["misses"]
+    s["hit_rate"] = round(s["hits"] / lookups, 3) if lookups else 0.0
+    s["parses_saved_per_min"] = round(s["hits"] / minutes, 1)
+    s["minutes"] = round(minutes, 1)
+    return s
+
+
+def reset_stats() -> None:
+    with _LOCK:
+        for k in ("hits", "misses", "writes", "invalidations"):
+            _STATS[k] = 0
+        _STATS["since"] = time.time()
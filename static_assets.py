@@ -0,0 +1,79 @@
+# static_assets.py
+import hashlib
+import os
+import shutil
+import threading
+
+import streamlit as st
+
+
+# Card art through Streamlit's static file serving (server.enableStaticServing in
+# .streamlit/config.toml) instead of st.image(), which re-reads and re-hashes the
+# PNG on every rerun and hands the browser a fresh media URL each time.
+#
+# url_for(path) mirrors an app file into static/ (hard link, copy as fallback) and
+# returns "app/static/<relpath>?v=<content hash>". The ?v= makes the URL change
+# whenever the bytes do, and tornado's static handler answers versioned URLs with
+# a far-future Cache-Control, so each browser downloads an image once.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, "static")
+URL_PREFIX = "app/static"
+
+_LOCK = threading.Lock()
+_PUBLISHED = {}  # abspath -> (stamp, url)
+
+
+def enabled() -> bool:
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def _content_hash(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()[:12]
+
+
+def _mirror(src: str, dst: str) -> None:
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def url_for(path: str | None) -> str | None:
+    """Cache-friendly static URL for a file inside the app dir, or None."""
+    if not path:
+        return None
+    src = os.path.abspath(path)
+    rel = os.path.relpath(src, APP_DIR)
+    if rel.startswith(os.pardir) or os.path.isabs(rel):
+        return None
+    try:
+        st_ = os.stat(src)
+    except OSError:
+        return None
+    stamp = (st_.st_mtime_ns, st_.st_size)
+
+    with _LOCK:
+        hit = _PUBLISHED.get(src)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+
+    try:
+        digest = _content_hash(src)
+        _mirror(src, os.path.join(STATIC_DIR, rel))
+    except OSError:
+        return None
+    url = f"{URL_PREFIX}/{rel.replace(os.sep, '/')}?v={digest}"
+    with _LOCK:
+        _PUBLISHED[src] = (stamp, url)
+    return url
@@ -5,6 +5,7 @@
 # HUB + STARPLACE MERGE (single file)
 # ================================
 
+import html as html_lib
 import json
 import os
 from datetime import datetime, timezone
@@ -12,8 +13,21 @@ from datetime import datetime, timezone
 import streamlit as st
 
 # Local modules (must exist in repo root)
+import asset_cache
+import balance_index
+import bank_store
 import careon_bubble
+import card_catalog
 import careon_market
+import codes_index
+import codes_mint
+import file_txn
+import json_cache
+import static_assets
+import style_registry
+import used_codes_store
+import user_directory
+import username_store
 import careon_bubble_ticker
 
 
@@ -25,6 +39,7 @@ APP_DIR = os.path.dirname(__file__)
 # NOTE: Your repo image earlier suggested you may have careon_bank.json
 # If your repo file is actually careon_bank.json, change this to "careon_bank.json".
 BANK_PATH = os.path.join(APP_DIR, "careon_bank_v2.json")
+BANK_DB_PATH = os.path.join(APP_DIR, "careon_bank_v2.db")  # used when SLD_BANK_BACKEND = "sqlite"
 CODES_PATH = os.path.join(APP_DIR, "codes_ledger.json")
 USERS_PATH = os.path.join(APP_DIR, "user_profile.json")
 
@@ -49,6 +64,21 @@ st.set_page_config(
 )
 
 
+def _setting(name: str, default: str) -> str:
+    # st.secrets first (Streamlit Cloud), then env var
+    try:
+        value = st.secrets.get(name, None)
+    except Exception:
+        value = None
+    return str(value or os.environ.get(name, default))
+
+
+# Stylesheets: built once per process, sent once per browser session ("head"),
+# or re-sent every rerun ("markdown", the old behaviour)
+style_registry.set_mode(_setting("SLD_STYLE_MODE", "head"))
+style_registry.begin_run()
+
+
 # ============================================================
 # 🎨 HUB DESIGN / CSS ZONE — SAFE TO EDIT (your original block)
 # ============================================================
@@ -71,7 +101,6 @@ THEME = {
 }
 
 CUSTOM_CSS = f"""
-<style>
 :root {{
   --bg-top: {THEME["bg_top"]};
   --bg-bottom: {THEME["bg_bottom"]};
@@ -180,9 +209,9 @@ CUSTOM_CSS = f"""
 .stButton > button {{
   border-radius: 12px !important;
 }}
-</style>
 """
-st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+style_registry.register("hub", lambda _key: CUSTOM_CSS)
+style_registry.inject("hub")
 
 # ============================================================
 # STARPLACE ACCESS (Hub-controlled)
@@ -197,13 +226,12 @@ def has_starplace_access(users_db: dict, user_id: str) -> bool:
 
 def grant_starplace_access(users_db: dict, user_id: str):
     # Mutates users_db in-place
-    for u in users_db.get("users", []):
-        if u.get("user_id") == user_id:
-            u.setdefault("claims", {})
-            u["claims"]["starplace_access"] = True
-            users_db.setdefault("meta", {})
-            users_db["meta"]["updated_at"] = _now_iso()
-            return
+    u = user_directory.get_directory(users_db).get(user_id)
+    if u is not None:
+        u.setdefault("claims", {})
+        u["claims"]["starplace_access"] = True
+        users_db.setdefault("meta", {})
+        users_db["meta"]["updated_at"] = _now_iso()
 
 
 
@@ -218,11 +246,26 @@ def _now_iso() -> str:
 
 def save_json(path: str, data):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # tmp + rename: readers in other sessions never see a half-written file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception:
+        json_cache.invalidate(path)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    # Write-through: the next rerun gets this object back without re-parsing
+    json_cache.put(path, data)
 
 
 def load_json_safe(path: str, default):
+    # Parsed once per file change for the whole process (see json_cache)
+    cached = json_cache.get(path)
+    if cached is not json_cache.MISS:
+        return cached
     try:
         if not os.path.exists(path):
             save_json(path, default)
@@ -232,12 +275,43 @@ def load_json_safe(path: str, default):
         if not raw:
             save_json(path, default)
             return default
-        return json.loads(raw)
+        data = json.loads(raw)
+        json_cache.put(path, data)
+        return data
     except Exception:
         st.session_state.setdefault("_json_warnings", set()).add(path)
         return default
 
 
+# Bank persistence backend: "json" (whole file), "sqlite" (row per tx) or "journal" (append-only + snapshots).
+# Migrate once with: python bank_store.py careon_bank_v2.json careon_bank_v2.db [--backend journal]
+BANK_STORE = bank_store.open_bank_store(
+    _setting("SLD_BANK_BACKEND", bank_store.DEFAULT_BACKEND),
+    json_path=BANK_PATH,
+    db_path=BANK_DB_PATH,
+    load_fn=load_json_safe,
+    save_fn=save_json,
+)
+
+
+def bank_txn(fn):
+    """
+    Run fn(bank) as one locked read-modify-write on the freshest bank state
+    (other sessions may have written since this rerun loaded it). Rebinds the
+    module-level `bank` to the saved state and returns fn's result.
+    """
+    global bank
+    result, bank = BANK_STORE.transact(bank, fn, default_bank)
+    return result
+
+
+# Redeemed DEP- codes (table in the bank db, whatever the bank backend)
+USED_CODES = used_codes_store.UsedCodeStore(BANK_DB_PATH)
+
+# Case-folded username index with reservations (same db)
+USERNAMES = username_store.UsernameStore(BANK_DB_PATH)
+
+
 def load_text_safe(path: str):
     try:
         if not os.path.exists(path):
@@ -257,7 +331,7 @@ def default_bank():
         "total_spent": 0,
         "balances_by_user": {},
         "txs": [],
-        "meta": {"version": "v3", "updated_at": _now_iso()},
+        "meta": {"version": "v3", "updated_at": _now_iso(), "tx_seq": 0, "balances_seq": 0},
     }
 
 
@@ -278,7 +352,7 @@ def default_users():
                 "claims": {"admin_auto": True, "intro_access": True, "all_access": True},
             }
         ],
-        "meta": {"version": "v3", "updated_at": _now_iso()},
+        "meta": {"version": "v3", "updated_at": _now_iso(), "user_seq": 0},
     }
 
 
@@ -298,21 +372,10 @@ def set_user_balance(bank: dict, user_id: str, value: int):
     bank["balances_by_user"][user_id] = int(value)
 
 
-def rebuild_user_balances_from_txs(bank: dict):
+def rebuild_user_balances_from_txs(bank: dict) -> int:
+    # Incremental: only txs newer than meta["balances_seq"] are replayed (see balance_index)
     ensure_user_balances(bank)
-    balances = {}
-    for t in reversed(bank.get("txs", [])):
-        uid = t.get("user_id") or "user-1"
-        amt = int(t.get("amount", 0))
-        typ = t.get("type")
-        bal = int(balances.get(uid, 0))
-        if typ == "deposit":
-            bal += amt
-        elif typ == "spend":
-            bal = max(0, bal - amt)
-        balances[uid] = bal
-    bank["balances_by_user"] = balances
-    bank.setdefault("meta", {})["updated_at"] = _now_iso()
+    return balance_index.catch_up(bank)
 
 
 def record_tx(bank: dict, user_id: str, tx_type: str, amount: int, description: str):
@@ -323,7 +386,8 @@ def record_tx(bank: dict, user_id: str, tx_type: str, amount: int, description:
         "amount": int(amount),
         "description": description.strip() if description else "",
     }
-    bank.setdefault("txs", []).insert(0, tx)
+    BANK_STORE.stage(bank, tx)
+    balance_index.advance(bank, tx)
     bank.setdefault("meta", {})["updated_at"] = _now_iso()
     return tx
 
@@ -338,6 +402,20 @@ def deposit(bank: dict, user_id: str, amount: int, description: str = ""):
     return record_tx(bank, user_id, "deposit", amount, description)
 
 
+def redeem(bank: dict, user_id: str, amount: int, description: str = ""):
+    # Code redemption: one "redeem" tx carries both legs (bank_store.tx_deltas), so every
+    # backend applies the 95% user / 5% sld_network_fund split in the same write
+    amount = int(amount)
+    if amount <= 0:
+        raise ValueError("Redemption amount must be greater than 0.")
+    user_share, fund_share = bank_store.redemption_split(amount)
+    bank["balance"] = int(bank.get("balance", 0)) + user_share
+    set_user_balance(bank, user_id, get_user_balance(bank, user_id) + user_share)
+    bank["total_earned"] = int(bank.get("total_earned", 0)) + user_share
+    bank["sld_network_fund"] = int(bank.get("sld_network_fund", 0)) + fund_share
+    return record_tx(bank, user_id, "redeem", amount, description)
+
+
 def spend(bank: dict, user_id: str, amount: int, description: str = ""):
     amount = int(amount)
     if amount <= 0:
@@ -352,27 +430,137 @@ def spend(bank: dict, user_id: str, amount: int, description: str = ""):
 
 
 def recent_txs(bank: dict, n: int = 10, user_id: str | None = None):
-    txs = bank.get("txs", [])
-    if user_id:
-        txs = [t for t in txs if t.get("user_id") == user_id]
-    return txs[: max(0, int(n))]
+    return BANK_STORE.recent_txs(bank, n, user_id=user_id)
+
+
+def page_txs(bank: dict, limit: int = 25, cursor: int | None = None, user_id: str | None = None):
+    # Newest-first page via the per-user tx index -> (txs, next_cursor); next_cursor None = last page
+    return BANK_STORE.page_txs(bank, limit, cursor=cursor, user_id=user_id)
 
 
 def find_code(ledger: dict, code: str):
-    for row in ledger.get("codes", []):
-        if row.get("code") == code:
-            return row
-    return None
+    # O(1): process-wide index keyed by normalized code (rebuilt when the file changes)
+    return codes_index.find_code(ledger, code, path=CODES_PATH)
+
+
+def mark_code_used(ledger: dict, row: dict, user_id: str):
+    codes_index.set_status(ledger, row, "used", path=CODES_PATH)
+    row["used_by"] = user_id
+    row["used_at"] = _now_iso()
+    ledger.setdefault("meta", {})["updated_at"] = _now_iso()
+
+
+def json_txn(path: str, fn, default_factory):
+    """fn(data) as one locked, rev-checked read-modify-write of a JSON file (file_txn) -> (result, data)."""
+    return file_txn.transact_json(path, lambda: load_json_safe(path, default_factory()), fn, save_json)
+
+
+def users_txn(fn):
+    """bank_txn() for the users file: fn(users) on the freshest copy; rebinds `users_db`."""
+    global users_db
+    result, users_db = json_txn(USERS_PATH, fn, default_users)
+    return result
+
+
+def codes_txn(fn):
+    """bank_txn() for the codes ledger: fn(ledger) on the freshest copy; rebinds `ledger`."""
+    global ledger
+    result, ledger = json_txn(CODES_PATH, fn, default_codes)
+    codes_index.note_saved(ledger, CODES_PATH)
+    return result
+
+
+def _reset_doc(default_factory):
+    # fn for users_txn/codes_txn: replace the whole document (the rev chain continues)
+    def _reset(data: dict):
+        data.clear()
+        data.update(default_factory())
+
+    return _reset
+
+
+def redeem_access_code(code: str, display_name: str, vibe: str, *, via: str = "", claims: dict | None = None):
+    """
+    Join with an access code as ONE commit across users, codes and (JSON backend)
+    bank: the username is reserved first (USERNAMES), the code and name are
+    re-checked on the freshest files, then the user is created, the code marked
+    used and the sign-on bonus redeemed (an access code is a code redemption, so
+    the bonus is split 95/5 like any other). Nothing is written if any step fails.
+    Raises ValueError if the code or name is taken. Returns (new_user, title, bonus).
+    """
+    global users_db, ledger, bank
+    if not USERNAMES.reserve(display_name):
+        raise ValueError("That username is already taken.")
+    loaders = {
+        USERS_PATH: lambda: load_json_safe(USERS_PATH, default_users()),
+        CODES_PATH: lambda: load_json_safe(CODES_PATH, default_codes()),
+    }
+    # sqlite/journal banks don't live in BANK_PATH; they get their own transaction below
+    bank_in_txn = BANK_STORE.backend == "json"
+    if bank_in_txn:
+        loaders[BANK_PATH] = lambda: BANK_STORE.load(default_bank())
+    description = "Sign-on bonus ({title})" + (f" via {via}" if via else "")
+
+    def _join(docs: dict):
+        row = find_code(docs[CODES_PATH], code)
+        if not row:
+            raise ValueError("Invalid code.")
+        if row.get("status") != "new":
+            raise ValueError("That code has already been used.")
+        if user_directory.get_directory(docs[USERS_PATH]).name_taken(display_name):
+            raise ValueError("That username is already taken.")
+
+        package = row.get("package", {}) or {}
+        title = package.get("title", "Frontier")
+        bonus = int(package.get("sign_on_bonus", 500))
+        new_user = create_user(docs[USERS_PATH], display_name=display_name, vibe=vibe, title=title, role="player")
+        new_user.setdefault("claims", {}).update(claims or {})
+        mark_code_used(docs[CODES_PATH], row, new_user["user_id"])
+        if bank_in_txn:
+            redeem(docs[BANK_PATH], new_user["user_id"], bonus, description=description.format(title=title))
+        return new_user, title, bonus
+
+    try:
+        (new_user, title, bonus), docs = file_txn.transact_files(loaders, _join, txn_dir=APP_DIR)
+    except BaseException:
+        USERNAMES.release(display_name)
+        raise
+    USERNAMES.confirm(display_name, new_user["user_id"])
+    users_db, ledger = docs[USERS_PATH], docs[CODES_PATH]
+    codes_index.note_saved(ledger, CODES_PATH)
+    if bank_in_txn:
+        bank = docs[BANK_PATH]
+        BANK_STORE.note_saved()
+    else:
+        bank_txn(lambda b: redeem(b, new_user["user_id"], bonus, description=description.format(title=title)))
+    return new_user, title, bonus
+
+
+def _seed_user_seq(users_db: dict) -> int:
+    # Migration for files written before meta.user_seq: start after the highest user-N
+    highest = 0
+    for u in users_db.get("users", []):
+        uid = str(u.get("user_id") or "")
+        if uid.startswith("user-") and uid[5:].isdigit():
+            highest = max(highest, int(uid[5:]))
+    return highest
 
 
 def next_user_id(users_db: dict) -> str:
-    existing = {u.get("user_id") for u in users_db.get("users", [])}
-    i = 1
+    """
+    Allocates from the monotonic users_db["meta"]["user_seq"] (ids are never
+    reused, even after deletions). Persisted with the users file; concurrent
+    signups are serialized by the users/codes commit (file_txn).
+    """
+    meta = users_db.setdefault("meta", {})
+    if "user_seq" not in meta:
+        meta["user_seq"] = _seed_user_seq(users_db)
+    directory = user_directory.get_directory(users_db)
     while True:
-        uid = f"user-{i}"
-        if uid not in existing:
+        meta["user_seq"] = int(meta["user_seq"]) + 1
+        uid = f"user-{meta['user_seq']}"
+        if directory.get(uid) is None:  # guards hand-edited files
             return uid
-        i += 1
 
 
 def create_user(users_db: dict, display_name: str, vibe: str, title: str, role: str = "player"):
@@ -394,38 +582,40 @@ def create_user(users_db: dict, display_name: str, vibe: str, title: str, role:
         },
     }
     users_db["users"].append(user)
+    user_directory.get_directory(users_db).add(user)
     users_db.setdefault("meta", {})["updated_at"] = _now_iso()
     return user
 
 
 def get_user_record(users_db: dict, user_id: str) -> dict:
-    for u in users_db.get("users", []):
-        if u.get("user_id") == user_id:
-            return u
-    return {}
+    return user_directory.get_directory(users_db).get(user_id) or {}
 
 
 def _ensure_admin_user(users_db: dict):
+    if user_directory.get_directory(users_db).get("bshapp") is not None:
+        return
+    users_txn(_add_admin_user)
+
+
+def _add_admin_user(users_db: dict):
     users_db.setdefault("users", [])
     users_db.setdefault("meta", {})
-    for u in users_db["users"]:
-        if u.get("user_id") == "bshapp":
-            return
-    users_db["users"].insert(
-        0,
-        {
-            "user_id": "bshapp",
-            "display_name": "bshapp",
-            "vibe": "Admin",
-            "title": "Founder",
-            "role": "admin",
-            "created_at": _now_iso(),
-            "claims": {"admin_auto": True, "intro_access": True, "all_access": True},
-            "starplace": {"confirmed": True, "theme_key": "nebula_ink", "avatar": "✨", "quote": ""},
-        },
-    )
+    directory = user_directory.get_directory(users_db)
+    if directory.get("bshapp") is not None:
+        return
+    admin = {
+        "user_id": "bshapp",
+        "display_name": "bshapp",
+        "vibe": "Admin",
+        "title": "Founder",
+        "role": "admin",
+        "created_at": _now_iso(),
+        "claims": {"admin_auto": True, "intro_access": True, "all_access": True},
+        "starplace": {"confirmed": True, "theme_key": "nebula_ink", "avatar": "✨", "quote": ""},
+    }
+    users_db["users"].insert(0, admin)
+    directory.add(admin)
     users_db["meta"]["updated_at"] = _now_iso()
-    save_json(USERS_PATH, users_db)
 
 
 def admin_unlocked(active_user_id: str) -> bool:
@@ -448,6 +638,19 @@ def _safe_join_app_path(app_dir: str, rel_path: str | None) -> str | None:
     return os.path.join(app_dir, rel_path)
 
 
+CARDS_PAGE_SIZES = [12, 24, 48]
+
+
+def _card_art(card: dict, prefer_thumb: bool = True) -> str | None:
+    # Thumbs come from `python thumbs_build.py`; fall back to full art until they exist
+    order = ("thumb", "image") if prefer_thumb else ("image", "thumb")
+    for key in order:
+        full = _safe_join_app_path(APP_DIR, card.get(key))
+        if full and os.path.exists(full):
+            return card.get(key)
+    return None
+
+
 def render_card_tile(
     name: str,
     image_path: str | None,
@@ -461,7 +664,15 @@ def render_card_tile(
     exists = bool(full_path and os.path.exists(full_path))
 
     with st.container():
-        if exists:
+        url = static_assets.url_for(full_path) if exists and static_assets.enabled() else None
+        if url:
+            # Static URL: the browser fetches (and caches) the PNG once, not per rerun
+            st.markdown(
+                f'<img src="{url}" alt="{html_lib.escape(name or "card")}" loading="lazy" '
+                'style="width:100%;display:block;border-radius:14px;" />',
+                unsafe_allow_html=True,
+            )
+        elif exists:
             st.image(full_path, use_container_width=True)
         else:
             label = placeholder_label if placeholder_label is not None else (name or "CARD")
@@ -495,7 +706,10 @@ def render_card_tile(
 # ============================================================
 # LOAD JSON
 # ============================================================
-bank = load_json_safe(BANK_PATH, default_bank())
+# Finish any multi-file commit (users + codes + bank) cut short by a crash
+file_txn.recover_once(APP_DIR)
+
+bank = BANK_STORE.load(default_bank())
 ledger = load_json_safe(CODES_PATH, default_codes())
 users_db = load_json_safe(USERS_PATH, default_users())
 
@@ -511,10 +725,28 @@ try:
 except Exception as e:
     st.warning(f"Admin bootstrap skipped: {e}")
 
+# Once per users-file revision: match the usernames table to the users file
+username_store.sync_once(USERNAMES, users_db)
+
 ensure_user_balances(bank)
-if not bank.get("balances_by_user"):
-    rebuild_user_balances_from_txs(bank)
-    save_json(BANK_PATH, bank)
+if not BANK_STORE.maintains_balances and balance_index.needs_catch_up(bank):
+    try:
+        bank_txn(lambda b: rebuild_user_balances_from_txs(b) if balance_index.needs_catch_up(b) else None)
+    except file_txn.ConflictError:
+        pass  # another session is writing; the next rerun catches up
+
+
+def _migrate_used_codes(b: dict):
+    USED_CODES.import_codes(b.get("used_deposit_codes") or [])
+    b.pop("used_deposit_codes", None)
+
+
+# One-shot: move the legacy used_deposit_codes list out of the bank
+if "used_deposit_codes" in bank:
+    try:
+        bank_txn(_migrate_used_codes)
+    except file_txn.ConflictError:
+        pass  # retried on the next rerun
 
 
 # ============================================================
@@ -559,28 +791,17 @@ if not st.session_state["entry_ok"]:
             st.info("Token not recognized (or already used).")
             st.stop()
 
-        existing = {u.get("display_name", "").strip().lower() for u in users_db.get("users", [])}
-        if display_name.lower() in existing:
+        if user_directory.get_directory(users_db).name_taken(display_name):
             st.info("That username is taken. Try adding a number.")
             st.stop()
 
-        package = row.get("package", {}) or {}
-        title = package.get("title", "Frontier")
-        bonus = int(package.get("sign_on_bonus", 500))
         vibe = "Vibe: ON" if vibe_yes else "Vibe: OFF"
 
-        new_user = create_user(users_db, display_name=display_name, vibe=vibe, title=title, role="player")
-
-        row["status"] = "used"
-        row["used_by"] = new_user["user_id"]
-        row["used_at"] = _now_iso()
-        ledger.setdefault("meta", {})["updated_at"] = _now_iso()
-
-        deposit(bank, new_user["user_id"], bonus, description=f"Sign-on bonus ({title})")
-
-        save_json(USERS_PATH, users_db)
-        save_json(CODES_PATH, ledger)
-        save_json(BANK_PATH, bank)
+        try:
+            new_user, title, bonus = redeem_access_code(token, display_name, vibe)
+        except ValueError as e:
+            st.info(str(e))
+            st.stop()
 
         st.session_state["entry_ok"] = True
         st.session_state["active_user_id"] = new_user["user_id"]
@@ -588,6 +809,7 @@ if not st.session_state["entry_ok"]:
         st.success("Success. Stay tuned ⭐")
         st.rerun()
 
+    style_registry.end_run()  # the gate page rendered in full
     st.stop()
 
 
@@ -596,8 +818,8 @@ if not st.session_state["entry_ok"]:
 # ============================================================
 st.sidebar.markdown(f"## {APP_ICON} {APP_TITLE}")
 
-user_ids = [u.get("user_id", "user-1") for u in users_db.get("users", [])] or ["user-1"]
-display_map = {u.get("user_id"): u.get("display_name", u.get("user_id")) for u in users_db.get("users", [])}
+user_ids = user_directory.get_directory(users_db).ids() or ["user-1"]
+display_map = user_directory.get_directory(users_db).display_names()
 
 active_user = st.session_state.get("active_user_id") or "bshapp"
 
@@ -657,23 +879,21 @@ with st.sidebar.expander("⚡ Quick Redeem", expanded=False):
             if not admin_unlocked(active_user):
                 st.error("Admin only.")
             else:
-                row = find_code(ledger, (code or "").strip())
-                if not row or row.get("status") != "new":
-                    st.error("Invalid/used code.")
+                def _use_admin_code(codes_doc: dict) -> int:
+                    # Re-checked on the freshest ledger: a Join may have used the code meanwhile
+                    row = find_code(codes_doc, (code or "").strip())
+                    if not row or row.get("status") != "new":
+                        raise ValueError("Invalid/used code.")
+                    mark_code_used(codes_doc, row, active_user)
+                    return int((row.get("package", {}) or {}).get("award_careon", 0) or 0)
+
+                try:
+                    award = codes_txn(_use_admin_code)
+                except ValueError as e:
+                    st.error(str(e))
                 else:
-                    pkg = row.get("package", {}) or {}
-                    award = int(pkg.get("award_careon", 0) or 0)
-                    # mark used
-                    row["status"] = "used"
-                    row["used_by"] = active_user
-                    row["used_at"] = _now_iso()
-                    ledger.setdefault("meta", {})["updated_at"] = _now_iso()
-
                     if award > 0:
-                        deposit(bank, active_user, award, description="Admin code award")
-                        save_json(BANK_PATH, bank)
-
-                    save_json(CODES_PATH, ledger)
+                        bank_txn(lambda b: deposit(b, active_user, award, description="Admin code award"))
                     st.success("Redeemed.")
                     st.rerun()
 
@@ -686,8 +906,7 @@ with st.sidebar.expander("⚡ Quick Redeem", expanded=False):
                 if amt <= 0:
                     st.info("Enter an amount > 0.")
                 else:
-                    deposit(bank, target, int(amt), description="Admin award")
-                    save_json(BANK_PATH, bank)
+                    bank_txn(lambda b: deposit(b, target, int(amt), description="Admin award"))
                     st.success("Awarded.")
                     st.rerun()
         else:
@@ -777,7 +996,9 @@ careon_market.render_market(
     bank=bank,
     active_user=active_user,
     deposit_fn=deposit,
-    save_fn=lambda: save_json(BANK_PATH, bank),
+    redeem_fn=redeem,
+    transact_fn=bank_txn,
+    used_codes=USED_CODES,
 )
 
 
@@ -807,7 +1028,6 @@ def _sp_css(theme_key: str) -> str:
     shadow = "rgba(0,0,0,0.12)" if is_light else "rgba(0,0,0,0.28)"
 
     return f"""
-<style>
 /* Starplace theme is scoped to elements inside #starplace-root */
 #starplace-root {{
   --sp-accent: {t["swatch"]};
@@ -870,21 +1090,32 @@ def _sp_css(theme_key: str) -> str:
   letter-spacing: 0.06em;
   font-size: 0.75rem;
 }}
-</style>
 """
 
+
+style_registry.register("starplace", _sp_css)
+
+
 def _user_starplace(users_db: dict, user_id: str) -> dict:
+    # Read-only view with defaults (users_db is the shared cached copy; writes go through users_txn)
     urec = get_user_record(users_db, user_id)
-    urec.setdefault("starplace", {})
-    sp = urec["starplace"]
-    sp.setdefault("confirmed", False)
-    sp.setdefault("theme_key", "nebula_ink")
-    sp.setdefault("avatar", "✨")
-    sp.setdefault("quote", "")
-    return sp
+    return {
+        "confirmed": False,
+        "theme_key": "nebula_ink",
+        "avatar": "✨",
+        "quote": "",
+        **(urec.get("starplace") or {}),
+    }
 
-def _save_users():
-    save_json(USERS_PATH, users_db)
+def _update_starplace(user_id: str, **fields):
+    def _apply(users_db: dict):
+        urec = get_user_record(users_db, user_id)
+        if not urec:
+            raise ValueError("User not found.")
+        urec.setdefault("starplace", {}).update(fields)
+        users_db.setdefault("meta", {})["updated_at"] = _now_iso()
+
+    users_txn(_apply)
 
 def _has_starplace_access(users_db: dict, user_id: str) -> bool:
     urec = get_user_record(users_db, user_id)
@@ -939,10 +1170,8 @@ if view == "Overview":
                     disabled=not can_enter,
                 ):
                     try:
-                        spend(bank, active_user, STARPLACE_COST, "Starplace Access Gate")
-                        grant_starplace_access(users_db, active_user)
-                        save_json(BANK_PATH, bank)
-                        save_json(USERS_PATH, users_db)
+                        bank_txn(lambda b: spend(b, active_user, STARPLACE_COST, "Starplace Access Gate"))
+                        users_txn(lambda u: grant_starplace_access(u, active_user))
                         st.success("Starplace unlocked ⭐")
                         st.rerun()
                     except Exception as e:
@@ -989,8 +1218,7 @@ elif view == "Join (Redeem Code)":
             st.error("That username is reserved. Choose another.")
             st.stop()
 
-        existing_names = {u.get("display_name", "").strip().lower() for u in users_db.get("users", [])}
-        if display_name.lower() in existing_names:
+        if user_directory.get_directory(users_db).name_taken(display_name):
             st.error("That username is already taken. Choose another.")
             st.stop()
 
@@ -1002,33 +1230,22 @@ elif view == "Join (Redeem Code)":
             st.error("That code has already been used.")
             st.stop()
 
-        package = row.get("package", {}) or {}
-        title = package.get("title", "Frontier")
-        bonus = int(package.get("sign_on_bonus", 500))
-
-        new_user = create_user(users_db, display_name=display_name, vibe=vibe, title=title, role="player")
-
-        row["status"] = "used"
-        row["used_by"] = new_user["user_id"]
-        row["used_at"] = _now_iso()
-        ledger.setdefault("meta", {})["updated_at"] = _now_iso()
-
-        new_user.setdefault("claims", {})
-        new_user["claims"]["intro_access"] = True
-
-        deposit(bank, new_user["user_id"], bonus, description=f"Sign-on bonus ({title}) via access code")
-
-        save_json(USERS_PATH, users_db)
-        save_json(CODES_PATH, ledger)
-        save_json(BANK_PATH, bank)
+        try:
+            new_user, title, bonus = redeem_access_code(
+                code, display_name, vibe, via="access code", claims={"intro_access": True}
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
 
+        user_share, fund_share = bank_store.redemption_split(bonus)
         st.success("✅ Access code accepted. Welcome to the Frontier.")
         st.markdown(
             f"""
 **Username:** {new_user['display_name']}  
 **Vibe:** {new_user['vibe']}  
 **Title:** {new_user['title']}  
-**Bonus:** +{bonus} Careon (global + personal)
+**Bonus:** +{user_share} Careon (global + personal), {fund_share} to the SLD fund
 """
         )
         st.caption("You now have full hub access (Admin is locked).")
@@ -1045,36 +1262,18 @@ elif view == "Cards":
             st.rerun()
 
     manifest_path = os.path.join(APP_DIR, "assets", "manifests", "cards_manifest.json")
-    manifest = {"version": "v1", "sets": []}
+    # Compiled once per manifest change, shared by all sessions (see card_catalog)
+    catalog = card_catalog.get_catalog(manifest_path)
+    if catalog.error:
+        st.warning(f"Cards manifest not ready yet: {catalog.error}")
 
-    try:
-        with open(manifest_path, "r", encoding="utf-8") as f:
-            manifest = json.load(f)
-    except Exception as e:
-        st.warning(f"Cards manifest not ready yet: {e}")
-
-    sets = manifest.get("sets", []) or []
-    if not sets:
+    if not catalog.sets:
         st.info("No card sets yet. Add sets/cards to assets/manifests/cards_manifest.json")
 
-    all_cards = []
-    for s in sets:
-        set_name = s.get("set_name", "Unnamed Set")
-        for card in s.get("cards", []) or []:
-            c = dict(card)
-            c["_set_name"] = set_name
-            all_cards.append(c)
-
-    def _card_key(c: dict) -> str:
-        return c.get("card_id") or f"{c.get('_set_name','set')}-{c.get('name','card')}"
+    all_cards = catalog.cards
 
     st.session_state.setdefault("selected_card_id", None)
-    selected = None
-    if st.session_state["selected_card_id"]:
-        for c in all_cards:
-            if _card_key(c) == st.session_state["selected_card_id"]:
-                selected = c
-                break
+    selected = catalog.get(st.session_state["selected_card_id"])
 
     st.markdown("### ✦ Card Stage")
     stage_card = selected if selected else (all_cards[0] if all_cards else None)
@@ -1084,7 +1283,7 @@ elif view == "Cards":
     else:
         colA, colB = st.columns([2, 3])
         name = stage_card.get("name", "Card")
-        img = stage_card.get("image") or stage_card.get("thumb")
+        img = _card_art(stage_card, prefer_thumb=False)
 
         with colA:
             render_card_tile(name=name, image_path=img, subtitle=None)
@@ -1101,25 +1300,38 @@ elif view == "Cards":
 
     st.divider()
 
-    set_options = sorted({c.get("_set_name", "Unnamed Set") for c in all_cards})
-    rarity_options = sorted({(c.get("rarity") or "").strip() for c in all_cards if (c.get("rarity") or "").strip()})
-
     with st.expander("Filters", expanded=True):
-        f_set = st.selectbox("Set", ["All"] + set_options)
-        f_rarity = st.selectbox("Rarity", ["All"] + rarity_options) if rarity_options else "All"
-        search = st.text_input("Search name")
-
-    def _match(c: dict) -> bool:
-        if f_set != "All" and c.get("_set_name") != f_set:
-            return False
-        if f_rarity != "All" and (c.get("rarity") or "").strip() != f_rarity:
-            return False
-        if search and search.lower() not in (c.get("name", "") or "").lower():
-            return False
-        return True
-
-    cards = [c for c in all_cards if _match(c)]
-    st.caption(f"Showing {len(cards)} card(s)")
+        f_set = st.selectbox("Set", ["All"] + catalog.set_options)
+        f_rarity = st.selectbox("Rarity", ["All"] + catalog.rarity_options) if catalog.rarity_options else "All"
+        f_tag = st.selectbox("Tag", ["All"] + catalog.tag_options) if catalog.tag_options else "All"
+        search = st.text_input("Search", placeholder="Name, tags or text (typos OK)")
+
+    positions = catalog.filter(
+        set_name=None if f_set == "All" else f_set,
+        rarity=None if f_rarity == "All" else f_rarity,
+        tag=None if f_tag == "All" else f_tag,
+    )
+    if search.strip():
+        # Ranked full-text results, restricted to the filtered positions
+        allowed = set(positions) if len(positions) < len(all_cards) else None
+        ranked = catalog.search_index().search(search)
+        matches = [p for p, _ in ranked if allowed is None or p in allowed]
+    else:
+        matches = positions
+
+    # Only one page of tiles is rendered; the page resets when the filters change
+    st.session_state.setdefault("cards_page_size", CARDS_PAGE_SIZES[1])
+    page_size = int(st.session_state["cards_page_size"])
+    filter_sig = (f_set, f_rarity, f_tag, search.strip(), page_size)
+    if st.session_state.get("cards_filter_sig") != filter_sig:
+        st.session_state["cards_filter_sig"] = filter_sig
+        st.session_state["cards_page"] = 0
+    n_pages = max(1, -(-len(matches) // page_size))
+    page = min(int(st.session_state.get("cards_page", 0)), n_pages - 1)
+    window = matches[page * page_size : (page + 1) * page_size]
+    cards = [all_cards[p] for p in window]
+
+    st.caption(f"Showing {len(cards)} of {len(matches)} card(s)")
 
     if not cards:
         st.info("No cards match your filters.")
@@ -1129,13 +1341,27 @@ elif view == "Cards":
             with cols[i % 4]:
                 render_card_tile(
                     name=card.get("name", "Card"),
-                    image_path=card.get("thumb") or card.get("image"),
+                    image_path=_card_art(card),
                     subtitle=card.get("rarity"),
                 )
-                if st.button(f"View: {card.get('name','Card')}", key=f"cardpick_{_card_key(card)}", use_container_width=True):
-                    st.session_state["selected_card_id"] = _card_key(card)
+                if st.button(f"View: {card.get('name','Card')}", key=f"cardpick_{card['_key']}", use_container_width=True):
+                    st.session_state["selected_card_id"] = card["_key"]
                     st.rerun()
 
+    p1, p2, p3, p4 = st.columns([1, 2, 1, 1])
+    with p1:
+        if st.button("← Prev", use_container_width=True, disabled=page == 0, key="cards_prev"):
+            st.session_state["cards_page"] = page - 1
+            st.rerun()
+    with p2:
+        st.caption(f"Page {page + 1} of {n_pages}")
+    with p3:
+        if st.button("Next →", use_container_width=True, disabled=page >= n_pages - 1, key="cards_next"):
+            st.session_state["cards_page"] = page + 1
+            st.rerun()
+    with p4:
+        st.selectbox("Per page", CARDS_PAGE_SIZES, key="cards_page_size", label_visibility="collapsed")
+
 elif view == "Economy":
     is_admin = admin_unlocked(active_user)
 
@@ -1162,26 +1388,60 @@ elif view == "Economy":
             if tx_type == "deposit":
                 if not is_admin:
                     raise ValueError("Deposits are admin-only.")
-                tx = deposit(bank, active_user, int(amount), desc)
+                tx = bank_txn(lambda b: deposit(b, active_user, int(amount), desc))
             else:
-                tx = spend(bank, active_user, int(amount), desc)
+                tx = bank_txn(lambda b: spend(b, active_user, int(amount), desc))
 
-            save_json(BANK_PATH, bank)
             st.success(f"Recorded {tx_type}: {tx['amount']}")
             st.rerun()
         except Exception as e:
             st.error(f"{e}")
 
     st.markdown("### Recent transactions (me)")
-    txs = recent_txs(bank, 25, user_id=active_user)
+    # Cursor stack per user: last entry is the page being shown (None = newest)
+    cursor_stack = st.session_state.setdefault("econ_tx_cursors", {}).setdefault(active_user, [None])
+    txs, next_cursor = page_txs(bank, 25, cursor=cursor_stack[-1], user_id=active_user)
     if txs:
         st.dataframe(txs, use_container_width=True, hide_index=True)
+        p1, p2, p3 = st.columns([1, 2, 1])
+        with p1:
+            if st.button("← Newer", use_container_width=True, disabled=len(cursor_stack) <= 1, key="econ_tx_newer"):
+                cursor_stack.pop()
+                st.rerun()
+        with p2:
+            st.caption(f"Page {len(cursor_stack)}")
+        with p3:
+            if st.button("Older →", use_container_width=True, disabled=next_cursor is None, key="econ_tx_older"):
+                cursor_stack.append(next_cursor)
+                st.rerun()
     else:
         st.info("No transactions yet.")
 
 elif view == "Codes":
     st.subheader("Codes Ledger")
     st.caption("Admin view. (Hidden from players.)")
+    new_by_pkg = codes_index.count_by_package(ledger, "new", path=CODES_PATH)
+    if new_by_pkg:
+        cols = st.columns(len(new_by_pkg))
+        for col, (pkg, n) in zip(cols, new_by_pkg.items()):
+            col.metric(f"New • {pkg}", n)
+
+    with st.expander("🪄 Mint a wave of codes", expanded=False):
+        templates = list(((ledger.get("meta", {}) or {}).get("templates") or codes_mint.DEFAULT_TEMPLATES).keys())
+        mint_tpl = st.selectbox("Template", templates, key="mint_template")
+        mint_n = st.number_input("How many", min_value=1, max_value=1_000_000, value=100, step=100, key="mint_count")
+        if st.button("Mint codes", use_container_width=True, key="mint_btn"):
+            try:
+                st.session_state["mint_report"] = codes_mint.mint_codes(CODES_PATH, int(mint_n), mint_tpl)
+                st.rerun()
+            except Exception as e:
+                st.error(f"Mint failed: {e}")
+        r = st.session_state.get("mint_report")
+        if r:
+            st.success(
+                f"Minted {r['minted']} ({r['template']}) in {r['seconds']}s • "
+                f"{r['codes_per_sec']} codes/s • {r['bytes_written']:,} bytes written"
+            )
     rows = ledger.get("codes", [])
     if rows:
         st.dataframe(rows, use_container_width=True, hide_index=True)
@@ -1219,10 +1479,8 @@ elif view == "Starplace":
 
         if st.button(f"Unlock Starplace ({fee} Careon)", use_container_width=True):
             try:
-                spend(bank, active_user, fee, description="Starplace unlock (one-time)")
-                _grant_starplace_access(users_db, active_user)
-                save_json(BANK_PATH, bank)
-                _save_users()
+                bank_txn(lambda b: spend(b, active_user, fee, description="Starplace unlock (one-time)"))
+                users_txn(lambda u: _grant_starplace_access(u, active_user))
                 st.success("Unlocked ⭐")
                 st.rerun()
             except Exception as e:
@@ -1232,7 +1490,7 @@ elif view == "Starplace":
     # Render starplace shell
     sp = _user_starplace(users_db, active_user)
     sp["theme_key"] = _sp_norm_theme(sp.get("theme_key", "nebula_ink"))
-    st.markdown(_sp_css(sp["theme_key"]), unsafe_allow_html=True)
+    style_registry.inject("starplace", _sp_norm_theme(sp["theme_key"]))
 
     st.markdown('<div id="starplace-root"><div class="sp-shell">', unsafe_allow_html=True)
     st.markdown('<div class="sp-title">STARPLACE</div>', unsafe_allow_html=True)
@@ -1265,14 +1523,9 @@ elif view == "Starplace":
     with t2:
         st.markdown('<div class="sp-module">', unsafe_allow_html=True)
         st.markdown("**Journal**")
-        urec = get_user_record(users_db, active_user)
-        urec.setdefault("starplace", {})
-        urec["starplace"].setdefault("journal", "")
-        j = st.text_area("Journal", value=urec["starplace"]["journal"], height=220, label_visibility="collapsed")
+        j = st.text_area("Journal", value=sp.get("journal", ""), height=220, label_visibility="collapsed")
         if st.button("Save Journal", use_container_width=True):
-            urec["starplace"]["journal"] = j or ""
-            users_db.setdefault("meta", {})["updated_at"] = _now_iso()
-            _save_users()
+            _update_starplace(active_user, journal=j or "")
             st.success("Saved ✅")
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -1293,13 +1546,12 @@ elif view == "Starplace":
         )
 
         if st.button("Apply", use_container_width=True):
-            urec = get_user_record(users_db, active_user)
-            urec.setdefault("starplace", {})
-            urec["starplace"]["quote"] = " ".join((quote or "").split())
-            urec["starplace"]["theme_key"] = _sp_norm_theme(theme_key)
-            urec["starplace"]["avatar"] = avatar
-            users_db.setdefault("meta", {})["updated_at"] = _now_iso()
-            _save_users()
+            _update_starplace(
+                active_user,
+                quote=" ".join((quote or "").split()),
+                theme_key=_sp_norm_theme(theme_key),
+                avatar=avatar,
+            )
             st.success("Applied ✅")
             st.rerun()
 
@@ -1329,6 +1581,65 @@ elif view == "Admin":
         st.markdown("**user_profile.json**")
         st.json(users_db)
 
+    st.markdown("### ⚡ JSON cache")
+    cs = json_cache.stats()
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("Hits", cs["hits"])
+    k2.metric("Misses (parses)", cs["misses"])
+    k3.metric("Hit rate", f"{cs['hit_rate']:.0%}")
+    k4.metric("Parses saved / min", cs["parses_saved_per_min"])
+    st.caption(f"{cs['entries']} file(s) cached • {cs['writes']} write-throughs • over {cs['minutes']} min")
+
+    st.markdown("### 🎨 Styles")
+    ss = style_registry.stats()
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("CSS bytes / rerun (before)", ss["requested"])
+    k2.metric("CSS bytes / rerun (now)", ss["sent"])
+    k3.metric("Saved", ss["saved"])
+    k4.metric("Sheets built", ss["built_sheets"])
+    st.caption(f"Mode: **{ss['mode']}** • figures are for the previous rerun of this session")
+    ac = asset_cache.stats()
+    st.caption(
+        f"🖼️ Asset cache: {ac['entries']} data URL(s), {ac['bytes'] // 1024} KB • "
+        f"{ac['hits']} hits / {ac['misses']} encodes • {ac['evictions']} evicted"
+    )
+    if st.button("Rebuild stylesheets", key="admin_styles_clear"):
+        style_registry.clear()
+        style_registry.resend()
+        st.rerun()
+
+    st.markdown("### 🧮 Balance index")
+    meta = bank.get("meta", {}) or {}
+    st.caption(
+        f"Backend: **{BANK_STORE.backend}** • "
+        f"checkpoint seq: **{meta.get('balances_seq', '—')}** / last tx seq: **{meta.get('tx_seq', '—')}**"
+    )
+    verify_key = f"{BANK_STORE.backend}:{BANK_PATH}"
+    if st.button("Verify balances (background)", key="admin_verify_balances"):
+        if balance_index.start_verification(verify_key, bank, BANK_STORE.history_source(bank)):
+            st.info("Verification started. Refresh to see the report.")
+        else:
+            st.info("A verification run is already in progress.")
+
+    report = balance_index.verification_report(verify_key)
+    if report:
+        if report.get("status") == "running":
+            st.caption(f"Verification running since {report.get('started_at')}…")
+        elif report.get("status") == "error":
+            st.error(f"Verification failed: {report.get('error')}")
+        elif report.get("drift"):
+            st.warning(f"Drift in {len(report['drift'])} user balance(s) ({report.get('checked_txs')} txs checked).")
+            st.dataframe(
+                [{"user_id": uid, **row} for uid, row in report["drift"].items()],
+                use_container_width=True,
+                hide_index=True,
+            )
+        else:
+            st.success(
+                f"No drift • {report.get('checked_txs')} txs / {report.get('users')} users "
+                f"checked in {report.get('seconds')}s ({report.get('finished_at')})"
+            )
+
     st.divider()
 
     st.markdown("### 🧨 Resets (protected)")
@@ -1348,24 +1659,26 @@ elif view == "Admin":
     with colA:
         if st.button("Reset bank", use_container_width=True):
             bank = default_bank()
-            save_json(BANK_PATH, bank)
+            BANK_STORE.replace(bank)
             st.success("Bank reset.")
             st.rerun()
 
     with colB:
         if st.button("Reset codes (empty)", use_container_width=True):
-            ledger = default_codes()
-            save_json(CODES_PATH, ledger)
+            codes_txn(_reset_doc(default_codes))
             st.success("Codes reset.")
             st.rerun()
 
     with colC:
         if st.button("Reset users (admin only)", use_container_width=True):
-            users_db = default_users()
-            save_json(USERS_PATH, users_db)
+            users_txn(_reset_doc(default_users))
+            USERNAMES.reconcile(users_db.get("users", []), min_age=0)
             st.success("Users reset.")
             st.rerun()
 
+# The rerun completed: the stylesheets it sent count as delivered (style_registry)
+style_registry.end_run()
+
 # ----------------------------
 # END OF APP
 # ----------------------------
@@ -0,0 +1,134 @@
+# style_registry.py
+import hashlib
+import json
+import threading
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+
+# Stylesheets are built once per (name, theme key) for the whole process, hashed,
+# and sent to a browser session only when that session doesn't have them yet.
+#
+# Why not st.markdown("<style>") once per session (the old _careon_market_css flag)?
+# Streamlit drops every element a rerun doesn't re-emit, <style> blocks included,
+# so a style sent only on the first run vanishes on the second. In "head" mode the
+# sheet is instead written into the page <head> by a tiny component script
+# (one <style id="sld-style-<name>"> per name, replaced when its digest changes,
+# e.g. a new Starplace theme), which survives reruns. "markdown" mode keeps the
+# old behaviour (every rerun, each sheet at most once) as a fallback.
+#
+# A sheet sent in head mode only counts as delivered once its rerun reaches
+# end_run(): a rerun that raises or is interrupted (st.rerun(), st.stop(), a
+# newer click) may never have run the script in the browser, so the next rerun
+# sends it again. Re-sending is harmless: the script skips an up-to-date <style>.
+#
+# Edits to a registered builder need an app restart or clear().
+
+MODES = ("head", "markdown")
+MODE = "head"
+
+_BUILDERS = {}  # name -> builder(key) -> css text (no <style> tags)
+_BUILT = {}  # (name, key) -> (css, digest)
+_LOCK = threading.Lock()
+
+_SESSION_KEY = "_sld_styles"  # name -> digest delivered to this browser session (confirmed by end_run)
+_RUN_KEY = "_sld_style_run"  # per-rerun bookkeeping + byte counts
+
+
+def set_mode(mode: str) -> None:
+    global MODE
+    MODE = mode if mode in MODES else "head"
+
+
+def register(name: str, builder) -> None:
+    """builder(key) returns the CSS text for a theme key (key is None for unthemed sheets)."""
+    with _LOCK:
+        _BUILDERS[name] = builder
+
+
+def clear() -> None:
+    with _LOCK:
+        _BUILT.clear()
+
+
+def resend() -> None:
+    """Forget what this session has, so the next inject() of each sheet sends it again."""
+    st.session_state.pop(_SESSION_KEY, None)
+
+
+def get(name: str, key=None) -> tuple[str, str]:
+    """(css, digest) for a sheet, built on first use by any session."""
+    with _LOCK:
+        built = _BUILT.get((name, key))
+        if built is None:
+            css = _BUILDERS[name](key).strip()
+            digest = hashlib.sha1(css.encode("utf-8")).hexdigest()[:12]
+            built = _BUILT[(name, key)] = (css, digest)
+        return built
+
+
+def _head_script(name: str, css: str, digest: str) -> str:
+    return f"""<script>
+(function () {{
+  const doc = window.parent.document;
+  const id = "sld-style-{name}";
+  let el = doc.getElementById(id);
+  if (el && el.dataset.digest === "{digest}") return;
+  if (!el) {{ el = doc.createElement("style"); el.id = id; doc.head.appendChild(el); }}
+  el.textContent = {json.dumps(css)};
+  el.dataset.digest = "{digest}";
+}})();
+</script>"""
+
+
+def begin_run() -> None:
+    """Call once at the top of the script: closes the previous rerun's byte counts."""
+    run = st.session_state.get(_RUN_KEY)
+    last = {"requested": run["requested"], "sent": run["sent"]} if run else None
+    st.session_state[_RUN_KEY] = {"emitted": set(), "pending": {}, "requested": 0, "sent": 0, "last": last}
+
+
+def end_run() -> None:
+    """Call once at the very end of the script: the head scripts this rerun sent are now delivered."""
+    run = st.session_state.get(_RUN_KEY)
+    if run and run.get("pending"):
+        st.session_state.setdefault(_SESSION_KEY, {}).update(run["pending"])
+        run["pending"] = {}
+
+
+def inject(name: str, key=None) -> None:
+    """Make sure this session has stylesheet `name` (for theme `key`)."""
+    css, digest = get(name, key)
+    run = st.session_state.get(_RUN_KEY)
+    if run is None:
+        begin_run()
+        run = st.session_state[_RUN_KEY]
+    size = len(css.encode("utf-8"))
+    run["requested"] += size  # what the per-rerun st.markdown version sent
+
+    if MODE == "markdown":
+        if (name, digest) in run["emitted"]:
+            return
+        run["emitted"].add((name, digest))
+        st.markdown(f"<style>\n{css}\n</style>", unsafe_allow_html=True)
+        run["sent"] += size
+        return
+
+    have = st.session_state.setdefault(_SESSION_KEY, {})
+    pending = run.setdefault("pending", {})
+    if have.get(name) == digest or pending.get(name) == digest:
+        return
+    script = _head_script(name, css, digest)
+    components.html(script, height=0)
+    pending[name] = digest
+    run["sent"] += len(script.encode("utf-8"))
+
+
+def stats() -> dict:
+    """Byte counts of the last complete rerun (requested = without the registry)."""
+    run = st.session_state.get(_RUN_KEY) or {}
+    last = run.get("last") or {"requested": 0, "sent": 0}
+    with _LOCK:
+        built = len(_BUILT)
+    return {"mode": MODE, "built_sheets": built, **last, "saved": last["requested"] - last["sent"]}
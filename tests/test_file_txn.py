@@ -0,0 +1,65 @@
+# tests/test_file_txn.py
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import file_txn  # noqa: E402
+
+
+def _write(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _crash_after_commit_point(tmp_path):
+    """Two files with a committed intent whose renames never ran."""
+    a, b = str(tmp_path / "codes_ledger.json"), str(tmp_path / "user_profile.json")
+    _write(a, {"meta": {"rev": 1}, "v": "old"})
+    _write(b, {"meta": {"rev": 1}, "v": "old"})
+    renames = []
+    for path in (a, b):
+        tmp = f"{path}.txn-crashed.tmp"
+        _write(tmp, {"meta": {"rev": 2}, "v": "new"})
+        renames.append((tmp, path, 2))
+    intent = tmp_path / ".txn-crashed.intent.json"
+    _write(str(intent), {"id": "crashed", "renames": renames})
+    return a, b, renames, intent
+
+
+def test_recover_applies_intent_whose_tmps_look_stale(tmp_path):
+    a, b, renames, intent = _crash_after_commit_point(tmp_path)
+    old = time.time() - 10 * file_txn.STALE_TMP_SECONDS
+    for tmp, _, _ in renames:
+        os.utime(tmp, (old, old))
+
+    assert file_txn.recover(str(tmp_path)) == 1
+    assert _read(a)["v"] == "new" and _read(b)["v"] == "new"
+    assert not intent.exists()
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+
+
+def test_missing_tmp_keeps_the_intent(tmp_path):
+    a, b, renames, intent = _crash_after_commit_point(tmp_path)
+    os.remove(renames[1][0])
+
+    assert file_txn.recover(str(tmp_path)) == 0
+    assert intent.exists()
+    assert _read(b)["v"] == "old"
+
+
+def test_stale_tmp_without_intent_is_swept(tmp_path):
+    tmp = tmp_path / "codes_ledger.json.txn-abandoned.tmp"
+    _write(str(tmp), {})
+    old = time.time() - 10 * file_txn.STALE_TMP_SECONDS
+    os.utime(tmp, (old, old))
+
+    file_txn.recover(str(tmp_path))
+    assert not tmp.exists()
@@ -0,0 +1,160 @@
+# thumbs_build.py
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image, features  # optional: only this offline tool needs Pillow
+except ImportError:  # pragma: no cover
+    Image = None
+    features = None
+
+
+# Offline thumbnail builder for assets/manifests/cards_manifest.json.
+#   python thumbs_build.py [--width 360] [--format webp|png] [--workers N] [--force]
+# For every card with an "image", writes a resized copy to its "thumb" path
+# (default assets/cards/thumbs/<card_id>.<format>) in a process pool, and records
+# "image_hash" / "thumb_hash" in the manifest. Cards whose image_hash still
+# matches the source bytes (and whose thumb exists) are skipped.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(APP_DIR, "assets", "manifests", "cards_manifest.json")
+THUMBS_DIR = "assets/cards/thumbs"
+DEFAULT_WIDTH = 360  # ~2x a 4-column grid tile
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def default_format() -> str:
+    if features is not None and features.check("webp"):
+        return "webp"
+    return "png"
+
+
+def _thumb_rel(card: dict, fmt: str) -> str:
+    if card.get("thumb"):
+        return str(card["thumb"]).lstrip("/")
+    return f"{THUMBS_DIR}/{card.get('card_id') or 'card'}.{fmt}"
+
+
+def _make_thumb(src: str, dst: str, width: int) -> str:
+    """Worker (runs in the pool): resize src into dst, return the thumb's hash."""
+    fmt = "WEBP" if dst.lower().endswith(".webp") else "PNG"
+    with Image.open(src) as im:
+        im.load()
+        if im.width > width:
+            height = max(1, round(im.height * width / im.width))
+            im = im.resize((width, height), Image.LANCZOS)
+        if fmt == "WEBP" and im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA")
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        tmp = f"{dst}.{os.getpid()}.tmp"
+        try:
+            if fmt == "WEBP":
+                im.save(tmp, "WEBP", quality=82, method=4)
+            else:
+                im.save(tmp, "PNG", optimize=True)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+    os.replace(tmp, dst)
+    return _hash_file(dst)
+
+
+def build_thumbs(
+    manifest_path: str = MANIFEST_PATH,
+    *,
+    width: int = DEFAULT_WIDTH,
+    fmt: str | None = None,
+    workers: int | None = None,
+    force: bool = False,
+) -> dict:
+    """
+    Builds missing/stale thumbs and writes the hashes back into the manifest.
+    Returns a report: built, skipped, missing, failed (list), seconds.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required to build thumbnails: pip install pillow")
+    fmt = fmt or default_format()
+    t0 = time.perf_counter()
+
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    jobs = []  # (card, src, src_hash, thumb_rel)
+    skipped = missing = 0
+    for s in manifest.get("sets", []) or []:
+        for card in s.get("cards", []) or []:
+            image = card.get("image")
+            src = os.path.join(APP_DIR, str(image).lstrip("/")) if image else None
+            if not src or not os.path.exists(src):
+                missing += 1
+                continue
+            src_hash = _hash_file(src)
+            thumb_rel = _thumb_rel(card, fmt)
+            if (
+                not force
+                and card.get("image_hash") == src_hash
+                and os.path.exists(os.path.join(APP_DIR, thumb_rel))
+            ):
+                skipped += 1
+                continue
+            jobs.append((card, src, src_hash, thumb_rel))
+
+    failed = []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                (card, src_hash, thumb_rel, pool.submit(_make_thumb, src, os.path.join(APP_DIR, thumb_rel), width))
+                for card, src, src_hash, thumb_rel in jobs
+            ]
+            for card, src_hash, thumb_rel, fut in futures:
+                try:
+                    card["thumb_hash"] = fut.result()
+                except Exception as e:
+                    failed.append(f"{card.get('card_id')}: {e}")
+                    continue
+                card["thumb"] = thumb_rel
+                card["image_hash"] = src_hash
+
+    built = len(jobs) - len(failed)
+    if built:
+        tmp = manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp, manifest_path)
+
+    return {
+        "built": built,
+        "skipped": skipped,
+        "missing": missing,
+        "failed": failed,
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build card thumbnails listed in cards_manifest.json.")
+    parser.add_argument("--manifest", default=MANIFEST_PATH)
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--format", choices=["webp", "png"], default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="rebuild even if the image hash is unchanged")
+    args = parser.parse_args()
+
+    r = build_thumbs(args.manifest, width=args.width, fmt=args.format, workers=args.workers, force=args.force)
+    print(f"Built {r['built']}, skipped {r['skipped']} unchanged, {r['missing']} without image ({r['seconds']}s)")
+    for line in r["failed"]:
+        print(f"  failed {line}")
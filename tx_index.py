@@ -0,0 +1,74 @@
+# tx_index.py
+import threading
+from bisect import bisect_left
+
+
+ALL_USERS = None  # key for the global (all users) posting list
+
+
+class TxIndex:
+    """
+    Secondary index over the bank's txs: user_id -> ascending (seq, locator) lists,
+    plus one global list. A locator is whatever the backend needs to fetch the tx
+    back in O(1) (list position for JSON, byte offset for the journal).
+
+    page() is cursor-based and newest-first: pass the returned next_cursor to
+    get the following page. Cost is O(log n + limit), independent of ledger size.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self) -> None:
+        self._seqs = {}  # key -> [seq, ...] ascending
+        self._locs = {}  # key -> [locator, ...] aligned with _seqs
+        self.last_seq = 0
+        self.position = 0  # backend-specific "scanned up to" marker
+
+    def add(self, seq: int, user_id: str, loc) -> None:
+        seq = int(seq)
+        for key in (ALL_USERS, user_id or "user-1"):
+            seqs = self._seqs.setdefault(key, [])
+            locs = self._locs.setdefault(key, [])
+            if seqs and seq <= seqs[-1]:
+                # Out-of-order add (rare): keep the lists sorted
+                i = bisect_left(seqs, seq)
+                if i < len(seqs) and seqs[i] == seq:
+                    locs[i] = loc
+                    continue
+                seqs.insert(i, seq)
+                locs.insert(i, loc)
+            else:
+                seqs.append(seq)
+                locs.append(loc)
+        self.last_seq = max(self.last_seq, seq)
+
+    def page(self, user_id: str | None, limit: int, cursor: int | None = None) -> tuple[list, int | None]:
+        """
+        Returns ([(seq, locator), ...] newest-first, next_cursor).
+        cursor = only txs with seq < cursor; None = start from the newest.
+        """
+        seqs = self._seqs.get(user_id, [])
+        locs = self._locs.get(user_id, [])
+        end = len(seqs) if cursor is None else bisect_left(seqs, int(cursor))
+        start = max(0, end - max(0, int(limit)))
+        rows = [(seqs[i], locs[i]) for i in range(end - 1, start - 1, -1)]
+        next_cursor = seqs[start] if start > 0 and rows else None
+        return rows, next_cursor
+
+    def count(self, user_id: str | None = ALL_USERS) -> int:
+        return len(self._seqs.get(user_id, []))
+
+
+# Process-wide: one index per bank file, shared by every session/rerun
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_index(key: str) -> TxIndex:
+    with _INDEXES_LOCK:
+        idx = _INDEXES.get(key)
+        if idx is None:
+            idx = _INDEXES[key] = TxIndex()
+        return idx
@@ -0,0 +1,80 @@
+# used_codes_store.py
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+
+# Redeemed deposit codes (DEP-<amount>-<token>) live in their own table instead of
+# bank["used_deposit_codes"], so the duplicate check is a primary-key lookup and the
+# bank JSON stops carrying an ever-growing list.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS used_deposit_codes (
+    code    TEXT PRIMARY KEY,
+    user_id TEXT,
+    used_at TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class UsedCodeStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def is_used(self, code: str) -> bool:
+        row = self.connect().execute("SELECT 1 FROM used_deposit_codes WHERE code = ?", (code,)).fetchone()
+        return row is not None
+
+    def claim(self, code: str, user_id: str | None = None) -> bool:
+        """
+        Atomically mark a code used. Returns False if it was already used
+        (by anyone, in any session/process).
+        """
+        cur = self.connect().execute(
+            "INSERT OR IGNORE INTO used_deposit_codes (code, user_id, used_at) VALUES (?, ?, ?)",
+            (code, user_id, _now_iso()),
+        )
+        return cur.rowcount == 1
+
+    def release(self, code: str) -> None:
+        """Undo a claim whose deposit failed."""
+        self.connect().execute("DELETE FROM used_deposit_codes WHERE code = ?", (code,))
+
+    def count(self) -> int:
+        return int(self.connect().execute("SELECT COUNT(*) FROM used_deposit_codes").fetchone()[0])
+
+    def import_codes(self, codes) -> int:
+        """One-shot migration from the legacy bank["used_deposit_codes"] list."""
+        conn = self.connect()
+        before = self.count()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO used_deposit_codes (code, user_id, used_at) VALUES (?, NULL, ?)",
+                [(str(c), _now_iso()) for c in codes if c],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.count() - before
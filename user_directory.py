@@ -0,0 +1,86 @@
+# user_directory.py
+import threading
+from collections import OrderedDict
+
+
+# Identity lookups over users_db["users"]:
+#   by_id:   user_id -> user record
+#   by_name: lower-cased display_name -> user record
+# Built once per loaded users_db (the parsed file is shared process-wide via
+# json_cache, so every session and rerun reuses the same directory) and kept in
+# sync by add(). A users list that changed size behind our back is re-indexed.
+
+
+def name_key(display_name) -> str:
+    return " ".join(str(display_name or "").split()).lower()
+
+
+class UserDirectory:
+    def __init__(self, users_db: dict):
+        self._users = users_db.setdefault("users", [])
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        by_id, by_name = {}, {}
+        for u in self._users:
+            by_id.setdefault(u.get("user_id"), u)
+            by_name.setdefault(name_key(u.get("display_name")), u)
+        self.by_id, self.by_name, self.n = by_id, by_name, len(self._users)
+        self._ids = None
+        self._display = None
+
+    def matches(self, users_db: dict) -> bool:
+        users = users_db.get("users")
+        return users is self._users and len(users) == self.n
+
+    def add(self, user: dict) -> None:
+        """Call right after appending/inserting `user` into users_db["users"]."""
+        self.by_id.setdefault(user.get("user_id"), user)
+        self.by_name.setdefault(name_key(user.get("display_name")), user)
+        self.n = len(self._users)
+        self._ids = None
+        self._display = None
+
+    def get(self, user_id: str) -> dict | None:
+        return self.by_id.get(user_id)
+
+    def find_by_name(self, display_name: str) -> dict | None:
+        return self.by_name.get(name_key(display_name))
+
+    def name_taken(self, display_name: str) -> bool:
+        return name_key(display_name) in self.by_name
+
+    def ids(self) -> list:
+        """user_ids in file order (cached until the next add/rebuild)."""
+        if self._ids is None:
+            self._ids = [u.get("user_id", "user-1") for u in self._users]
+        return self._ids
+
+    def display_names(self) -> dict:
+        """{user_id: display_name} (cached until the next add/rebuild)."""
+        if self._display is None:
+            self._display = {u.get("user_id"): u.get("display_name", u.get("user_id")) for u in self._users}
+        return self._display
+
+
+# id(users list) -> UserDirectory (the directory holds the list, so ids stay unique).
+# LRU: every transaction's private users copy gets an entry too, so the live
+# file's directory must stay at the recent end rather than age out in order.
+_DIRECTORIES = OrderedDict()
+_MAX_DIRECTORIES = 8
+_LOCK = threading.Lock()
+
+
+def get_directory(users_db: dict) -> UserDirectory:
+    users = users_db.setdefault("users", [])
+    with _LOCK:
+        d = _DIRECTORIES.get(id(users))
+        if d is None:
+            if len(_DIRECTORIES) >= _MAX_DIRECTORIES:
+                _DIRECTORIES.popitem(last=False)
+            d = _DIRECTORIES[id(users)] = UserDirectory(users_db)
+            return d
+        _DIRECTORIES.move_to_end(id(users))
+        if not d.matches(users_db):
+            d.rebuild()
+        return d
@@ -0,0 +1,140 @@
+# username_store.py
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+import file_txn
+from user_directory import name_key
+
+
+# Case-folded username uniqueness, shared by every session and process.
+# A Join first reserve()s the name (row with user_id NULL), then commits the
+# users/codes files, then confirm()s the row with the new user_id; on failure it
+# release()s the reservation. The PRIMARY KEY makes two simultaneous reservations
+# of the same name impossible. Reservations left by a crashed process expire.
+# reconcile() drops confirmed names whose user is gone from the users file (a
+# reset or a hand edit); rows younger than the reservation TTL are kept, since a
+# Join in another process may have confirmed a name this process's file predates.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usernames (
+    name_key    TEXT PRIMARY KEY,
+    user_id     TEXT,
+    reserved_at TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+RESERVATION_TTL_SECONDS = 120
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class UsernameStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def is_taken(self, display_name: str) -> bool:
+        row = self.connect().execute("SELECT 1 FROM usernames WHERE name_key = ?", (name_key(display_name),)).fetchone()
+        return row is not None
+
+    def reserve(self, display_name: str) -> bool:
+        """
+        Atomically reserve a name. Returns False if it is taken or reserved by
+        someone else (an expired, never-confirmed reservation is taken over).
+        """
+        now = datetime.now(timezone.utc)
+        expired = (now - timedelta(seconds=RESERVATION_TTL_SECONDS)).isoformat(timespec="seconds")
+        cur = self.connect().execute(
+            "INSERT INTO usernames (name_key, user_id, reserved_at) VALUES (?, NULL, ?) "
+            "ON CONFLICT(name_key) DO UPDATE SET reserved_at = excluded.reserved_at "
+            "WHERE usernames.user_id IS NULL AND usernames.reserved_at < ?",
+            (name_key(display_name), now.isoformat(timespec="seconds"), expired),
+        )
+        return cur.rowcount == 1
+
+    def confirm(self, display_name: str, user_id: str) -> None:
+        self.connect().execute(
+            "UPDATE usernames SET user_id = ? WHERE name_key = ?", (user_id, name_key(display_name))
+        )
+
+    def release(self, display_name: str) -> None:
+        """Drop a reservation whose Join failed (confirmed names are never released)."""
+        self.connect().execute(
+            "DELETE FROM usernames WHERE name_key = ? AND user_id IS NULL", (name_key(display_name),)
+        )
+
+    def count(self) -> int:
+        return int(self.connect().execute("SELECT COUNT(*) FROM usernames").fetchone()[0])
+
+    def import_users(self, users) -> int:
+        """Index names already in the users file (added before this table, or by hand)."""
+        conn = self.connect()
+        before = self.count()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO usernames (name_key, user_id, reserved_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name_key) DO UPDATE SET user_id = excluded.user_id WHERE usernames.user_id IS NULL",
+                [(name_key(u.get("display_name")), u.get("user_id"), _now_iso()) for u in users if u.get("display_name")],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.count() - before
+
+    def reconcile(self, users, min_age: int = RESERVATION_TTL_SECONDS) -> dict:
+        """
+        Makes the confirmed names match `users`: drops confirmed rows older than
+        min_age seconds whose (name, user_id) is not in it, then imports the rest.
+        Pending reservations are left alone. Returns {"removed": n, "added": n}.
+        """
+        live = {(name_key(u.get("display_name")), u.get("user_id")) for u in users if u.get("display_name")}
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=min_age)).isoformat(timespec="seconds")
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT name_key, user_id FROM usernames WHERE user_id IS NOT NULL AND reserved_at <= ?", (cutoff,)
+            ).fetchall()
+            stale = [(k,) for k, uid in rows if (k, uid) not in live]
+            conn.executemany("DELETE FROM usernames WHERE name_key = ?", stale)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return {"removed": len(stale), "added": self.import_users(users)}
+
+
+_SYNCED = {}
+_SYNC_LOCK = threading.Lock()
+
+
+def sync_once(store: UsernameStore, users_db: dict) -> dict | None:
+    """reconcile() once per users-file revision this process sees; None when already in sync."""
+    key = os.path.abspath(store.path)
+    rev = file_txn.get_rev(users_db)
+    with _SYNC_LOCK:
+        if _SYNCED.get(key) == rev:
+            return None
+        _SYNCED[key] = rev
+    return store.reconcile(users_db.get("users", []))